@@ -1,16 +1,53 @@
-import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
-from dotenv import load_dotenv
-from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import RunnablePassthrough
-from langchain_openai import ChatOpenAI
-from langchain_groq import ChatGroq
-from langchain_community.retrievers import TavilySearchAPIRetriever
-from langchain.document_loaders import WebBaseLoader
+from budget import assemble_context, context_budget, estimate_tokens
+from cache import repair_cache_key, response_cache_key
+from condense import condense_sources, fit_source, merge_fact_sheets
+from dedupe import dedupe_sources
+from config import FACT_SHEET_MAX_TOKENS, HEDGE_AFTER, JOB_WORKERS, JOBS_PATH, METRICS_PORT, RETRIEVAL_TOP_K
+from extract import strip_boilerplate_lines
+from jobs import DONE, FAILED, QUEUED, JobQueue
+from metrics import RunTrace, start_metrics_server
+from pipeline import (
+    PROVIDER_MODELS,
+    build_llm,
+    build_retriever,
+    create_embedding_cache,
+    create_fact_sheet_cache,
+    create_non_seo_chain,
+    create_response_cache,
+    create_seo_chain,
+    create_tavily_cache,
+    create_url_cache,
+)
+from prompts import MULTI_SOURCE_MODE, PROMPTS, SEO_MODE, fact_sheet_prompt
+from routing import HedgedChain
+from sources import MAX_URL_WORKERS, create_http_session, load_url_texts, search_tavily
+from validate import MODE_RULES, repair_output, validate_output
+
+# Chat models are cached per settings so their HTTP connection pools survive reruns
+@st.cache_resource(max_entries=8)
+def get_llm(provider, model, temperature, max_tokens, api_key):
+    return build_llm(provider, model, temperature, max_tokens, api_key)
+
+# The Tavily retriever is cached the same way
+@st.cache_resource(max_entries=8)
+def get_retriever(k, api_key):
+    return build_retriever(k, api_key)
+
+# Parsed prompt templates are memoized by their text, so reruns don't parse the prompt again
+@st.cache_resource(max_entries=32)
+def compile_prompt(template):
+    return ChatPromptTemplate.from_template(template)
 
-# Load environment variables (API Keys etc.)
-load_dotenv()
+# Optional Prometheus-style metrics endpoint, started once per server process
+@st.cache_resource
+def get_metrics_server():
+    return start_metrics_server(METRICS_PORT) if METRICS_PORT else None
+
+get_metrics_server()
 
 # Streamlit App Title
 st.title("Content Generator")
@@ -23,6 +60,10 @@ with st.sidebar:
     temperature = st.slider("Temperature", min_value=0.0, max_value=1.0, value=0.0)
     max_tokens = st.slider("Max Tokens", min_value=50, max_value=5000, value=3500)
     tavily_k = st.slider("Tavily Search Content", min_value=1, max_value=7, value=2)
+    stream_output = st.checkbox("Stream output", value=True)
+    repair_rules = st.checkbox("Repair rule violations", value=False, help="Outputs are checked against the prompt's rules (sentence length, forbidden verb forms, SEO title/spot length, word count). When on, only the broken sentences or sections are re-prompted and spliced back in.")
+    cache_responses = st.checkbox("Cache responses", value=False, help="Replay identical requests from a local cache instead of calling the model again.")
+    background_jobs = st.checkbox("Run in background", value=False, help="Queue the generation as a job. It keeps running when the page reruns and its result is saved.")
     
     # Input fields for API keys
     openai_api_key = st.text_input("OpenAI API Key", type="password")
@@ -32,353 +73,448 @@ with st.sidebar:
     # Select between Groq and OpenAI models
     model_provider = st.radio(
         "Select Model Provider:",
-        ("Groq", "OpenAI")
+        tuple(PROVIDER_MODELS)
     )
     
     # Show different model options based on provider
-    if model_provider == "OpenAI":
-        model_option = st.selectbox("Choose OpenAI Model:", ["gpt-4o", "gpt-4o-mini"])
-        if openai_api_key:
-            llm = ChatOpenAI(
-                model=model_option,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                openai_api_key=openai_api_key
-            )
-        else:
-            st.warning("Please provide OpenAI API Key.")
-    
-    elif model_provider == "Groq":
-        model_option = st.selectbox("Choose Groq Model:", ["llama3-70b-8192", "llama-3.1-70b-versatile"])
-        if groq_api_key:
-            llm = ChatGroq(
-                model=model_option,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                groq_api_key=groq_api_key
-            )
+    model_option = st.selectbox(f"Choose {model_provider} Model:", PROVIDER_MODELS[model_provider])
+    provider_api_key = openai_api_key if model_provider == "OpenAI" else groq_api_key
+    if provider_api_key:
+        llm = get_llm(model_provider, model_option, temperature, max_tokens, provider_api_key)
+    else:
+        st.warning(f"Please provide {model_provider} API Key.")
+
+    # Optionally hedge slow or failing requests with a model from the other provider
+    hedge_enabled = st.checkbox("Hedge with the other provider", value=False, help="If no first token arrives in time, or the request fails, the fallback model is asked too and the first to answer wins.")
+    if hedge_enabled:
+        secondary_provider = next(provider for provider in PROVIDER_MODELS if provider != model_provider)
+        secondary_model = st.selectbox(f"Fallback {secondary_provider} Model:", PROVIDER_MODELS[secondary_provider])
+        hedge_after = st.slider("Hedge after (seconds without a first token)", min_value=0.5, max_value=15.0, value=HEDGE_AFTER, step=0.5)
+        secondary_api_key = openai_api_key if secondary_provider == "OpenAI" else groq_api_key
+        if secondary_api_key:
+            secondary_llm = get_llm(secondary_provider, secondary_model, temperature, max_tokens, secondary_api_key)
         else:
-            st.warning("Please provide Groq API Key.")
+            st.warning(f"Please provide {secondary_provider} API Key to hedge requests.")
+            hedge_enabled = False
     
 # Initialize Retriever with the Tavily API Key
 if tavily_api_key:
-    retriever = TavilySearchAPIRetriever(k=tavily_k, include_raw_content=True, api_key=tavily_api_key)
+    retriever = get_retriever(tavily_k, tavily_api_key)
 else:
     st.warning("Please provide Tavily API Key.")
 
-
-
-
-
-# Define all prompts
-seo_content_prompt = """
-Sana verilen contexti kullanarak istenen konu hakkında SEO içerik üretmen bekleniyor.
-Türkçe düzgün kullanılmalı, ve profosyonel bir dili olmalı.
-
-Başlık Belirleme:
-
-* Soruya yanıt olarak, anahtar kelimeyi içeren ve dikkat çekici bir başlık oluştur. Başlığı 50-60 karakteri geçmeyecek şekilde düzenle.
-
-Spot Cümle (Özet) Oluşturma:
-
-* Soruya kısa ve öz bir yanıt vererek bu yanıtı meta açıklama formatında (150-160 karakter) yaz. Spot cümleyi, anahtar kelimeyi içerecek ve okuyucuyu içeriği okumaya teşvik edecek şekilde oluştur. Kullanıcının sayfada ne bulacağını net bir şekilde anlat. Şuna benzer "Daha fazla bilgi için tıklayın" ifadeler ekle.
-
-İçerik Oluşturma:
-
-* İçeriğin giriş, gelişme ve sonuç bölümlerini mantıklı bir sıralamayla yapılandır. Anahtar kelimenin doğal bir şekilde içerikte kullanılmasını sağla. İçeriği mantıklı bölümlere ayır ve alt başlıklar (H2, H3) ekle. Alt başlıklar anahtar kelimeleri barındırsın.
-
-İçerik Uzunluğu ve Derinliği Talimatları:
-
-İçerik Uzunluğu:
-
-* İçeriğin uzunluğu, en az 1000 kelime olmalıdır. Bu, SEO açısından minimum gereksinimi karşılar.
-
-İçerik Derinliği:
-
-* Kısa paragraflar, liste kullanımı, maddeler ve önemli bilgilerin vurgulanması gibi unsurlar eklenerek içeriğin kullanıcı dostu olmasını sağla.
-* "Ebilecek", "abilecek", "ebilir", "abilir", "mektedir", "maktadır" gibi fiillerden kaçın.  
-* Haberin akışını sağlamak için "ancak", "dolayısıyla", "buna ek olarak" gibi geçiş kelimelerini kullan. 
-* Haberi daha etkili sunabilmek için "dedi", "ifadelerini kullandı", "söyledi", "vurguladı", "aktardı", "diye yazdı", "dile getirdi", "açıkladı", "belirtti", "öne çıkardı", "altını çizdi", "şu sözlere yer verdi", "değindi", "işaret etti", "şunu kaydetti", "gündeme taşıdı" gibi ifadeleri konuşma, beyan ve demeç bölümlerinde sıkça kullan.
-* İçerikte yalnızca yüzeysel bilgilerle yetinme; konuyu detaylı ve kapsamlı bir şekilde ele al.
-* İçerik derinliğini artırmak için uzman görüşlerine veya güvenilir kaynaklara dayalı alıntılar ekle.
-* Anahtar kelimenin doğal bir şekilde yer aldığı ve konuyu derinlemesine açıklayan paragraflar oluştur.
-* İçeriğin kullanıcı sorularına tatmin edici ve çözüm odaklı yanıtlar verdiğinden emin ol.
-* Destekleyici örnekler, istatistikler veya araştırma sonuçları ekleyerek içeriğin güvenilirliğini artır.
-* Okuyucuyu içeriğe bağlayacak etkili argümanlar ve görüşler sun; ancak tüm bunlar tarafsız olsun.
-* İçeriğin sonuna doğru, konuyu toparlayarak okuyucuyu net bir sonuç ile baş başa bırak. Kullanıcıyı yönlendirecek açık bir çağrı yap.
-
-Context: {context}
-
-Konu: {konu}
-"""
-
-bir_metinden_haber_prompt = """
-Context içerisinde yer alan haber metinlerinden yola çıkarak yeni ve özgün bir haber oluşturman gerekiyor. Bu haber, tamamen orijinal olmalı ve intihal izlenimi vermemeli. Türkçe dil bilgisine uygun, akıcı ve profesyonel bir üslup kullanılmalı.
-
-BAŞLIK
- 
-* Başlıkta belirsizlik yarat, net olmayan ifadeler kullan. Başlık en fazla 12 kelime olsun, içeriği doğru yansıtsın. Soru cümlesi kullanma. Pasif yapı kullanma. Her bir başlık haberin farklı yönlerini vurgulayan çeşitli açılardan yaklaşmalı. 5 farklı başlık önerisi sun. Nokta ile ayır. 
-
-SPOT
-
-* Spot, başlıkla uyumlu ve haberin ana detaylarını özetler nitelikte olmalı. 1-2 cümle içinde kim, ne, nerede, ne zaman, nasıl, neden gibi soruların cevaplarını ver. Okuyucunun ilgisini çekecek ancak haberin tamamını açık etmeyecek bir dil kullan. Doğal şekilde anahtar kelimeler içermeli ve SEO uyumlu olmalı.
-
-HABER METNİ
-
-PARAGRAFLAR İÇİN TALİMATLAR
-
-* Metni tamamen özgün hale getir ve intihalden arındır. 
-* Paragrafları kısa tut, cümleler 12 kelimeyi geçmesin.
-* Kritik noktaları ve özel isimleri bold yap.
-* "Ebilecek", "abilecek", "ebilir", "abilir", "mektedir", "maktadır" gibi fiillerden kaçın.  
-* Aktif cümle yapıları kullan, pasif yapılardan kaçın. Bu sayede daha dinamik ve doğrudan cümleler oluştur. 
-* Haberin akışını sağlamak için "ancak", "dolayısıyla", "buna ek olarak" gibi geçiş kelimelerini kullan. 
-* Haberi daha etkili sunabilmek için "dedi", "ifadelerini kullandı", "söyledi", "vurguladı", "aktardı", "diye yazdı", "dile getirdi", "açıkladı", "belirtti", "öne çıkardı", "altını çizdi", "şu sözlere yer verdi", "değindi", "işaret etti", "şunu kaydetti", "gündeme taşıdı" gibi ifadeleri konuşma, beyan ve demeç bölümlerinde sıkça kullan.
-* Ara başlıkları büyük harflerle yaz. 
-* Gereksiz tekrarlar yapma. Aynı ifadeleri tekrarlama.
-*  SEO kurallarına uy. Anahtar kelime yoğunluğuna dikkat et. Meta açıklamaları, başlıklar ve alt başlıkları doğru kullan.
-* Metne dışarıdan yorum ya da sonuç ekleme.
-
-Giriş (İlk Paragraf)
-
-* Haberin en önemli detaylarını hızlı ve öz bir şekilde özetle. Kim, ne, nerede, ne zaman sorularına net cevap ver. 
-* İlk paragraf 30 kelimeyi geçmesin.
-
-Gelişme (Orta Paragraflar) 
-
-* Haberi detaylandırırken her paragraf kısa (3-4 cümle) ve net olmalı.
-
-Context: {context}
-"""
-
-birden_fazla_metinden_haber_prompt = """
-Context içerisinde yer alan haber metinlerinden yola çıkarak yeni ve özgün bir haber oluşturman gerekiyor. Bu haber, tamamen orijinal olmalı ve intihal izlenimi vermemeli. Türkçe dil bilgisine uygun, akıcı ve profesyonel bir üslup kullanılmalı.
-
-BAŞLIK
- 
-* Başlıkta belirsizlik yarat, net olmayan ifadeler kullan. Başlık en fazla 12 kelime olsun, içeriği doğru yansıtsın. Soru cümlesi kullanma. Pasif yapı kullanma. Her bir başlık haberin farklı yönlerini vurgulayan çeşitli açılardan yaklaşmalı. 5 farklı başlık önerisi sun. Nokta ile ayır. 
-
-SPOT
-
-* Spot, başlıkla uyumlu ve haberin ana detaylarını özetler nitelikte olmalı. 1-2 cümle içinde kim, ne, nerede, ne zaman, nasıl, neden gibi soruların cevaplarını ver. Okuyucunun ilgisini çekecek ancak haberin tamamını açık etmeyecek bir dil kullan. Doğal şekilde anahtar kelimeler içermeli ve SEO uyumlu olmalı.
-HABER METNİ
-
-
-* Metinleri tamamen özgün hale getir ve intihalden arındır.  
-
-Birbirlerine harmanla ve metinlere şu talimatları uygula:
-
-* Aynı konudaki birden fazla metni kullanarak zenginleştirilmiş, kapsamlı bir haber oluştur.
-Metinlerin ortak noktalarını tespit et ve bu unsurları haberin ana eksenine yerleştir. Farklı metinlerde geçen ek bilgileri ve çeşitli bakış açılarını kullanarak haberin detaylarını genişlet.
-
-Tematik Farklılıkları Kullan
-
-* Metinlerde yer alan farklı tema ve bilgileri vurgulayarak haberi daha derinlemesine incele. Bu sayede haber sadece bir kaynağa bağlı kalmadan, daha zengin ve kapsamlı bir içerik sunar. Ancak temalar arasındaki tutarlılığı korumaya dikkat et.
-
-Bilgilerin Uyumluluğuna Dikkat Et
-
-* Farklı kaynaklardaki bilgilerin uyumlu olmasına özen göster. Tutarsızlıkları fark ettiğinde ya doğrulanmış bilgiyi kullan ya da haberde denge kurarak tüm farklı görüşleri doğru şekilde yansıt. Gerektiğinde farklı perspektifleri bağlayıcı geçişlerle sun
-
-PARAGRAFLAR İÇİN TALİMATLAR
-
-* Metni tamamen özgün hale getir ve intihalden arındır. 
-* Paragrafları kısa tut, cümleler 12 kelimeyi geçmesin.
-* Kritik noktaları ve özel isimleri bold yap.
-* "Ebilecek", "abilecek", "ebilir", "abilir", "mektedir", "maktadır" gibi fiillerden kaçın.  
- * Aktif cümle yapıları kullan, pasif yapılardan kaçın. Bu sayede daha dinamik ve doğrudan cümleler oluştur. 
-* Haberin akışını sağlamak için "ancak", "dolayısıyla", "buna ek olarak" gibi geçiş kelimelerini kullan. 
-* Haberi daha etkili sunabilmek için "dedi", "ifadelerini kullandı", "söyledi", "vurguladı", "aktardı", "diye yazdı", "dile getirdi", "açıkladı", "belirtti", "öne çıkardı", "altını çizdi", "şu sözlere yer verdi", "değindi", "işaret etti", "şunu kaydetti", "gündeme taşıdı" gibi ifadeleri konuşma, beyan ve demeç bölümlerinde sıkça kullan.
-* Ara başlıkları büyük harflerle yaz. 
-* Gereksiz tekrarlar yapma. Aynı ifadeleri tekrarlama.
-*  SEO kurallarına uy. Anahtar kelime yoğunluğuna dikkat et. Meta açıklamaları, başlıklar ve alt başlıkları doğru kullan.
-* Metne dışarıdan yorum ya da sonuç ekleme.
-
-Giriş (İlk Paragraf)
-
-* Haberin en önemli detaylarını hızlı ve öz bir şekilde özetle. Kim, ne, nerede, ne zaman sorularına net cevap ver. İlk paragraf 30 kelimeyi geçmesin.
-
-Gelişme (Orta Paragraflar) 
-
-* Haberi detaylandırırken her paragraf kısa (3-4 cümle) ve net olmalı.
-Context: {context}
-"""
-
-kose_yazisindan_haber_prompt = """
-Context içerisinde yer alan haber metinlerinden yola çıkarak yeni ve özgün bir haber oluşturman gerekiyor. Bu haber, tamamen orijinal olmalı ve intihal izlenimi vermemeli. Türkçe dil bilgisine uygun, akıcı ve profesyonel bir üslup kullanılmalı.
-
-BAŞLIK
-
-Haber metninin özünü yansıtacak, kısa ve çarpıcı bir başlık oluştur. Başlık 8-12 kelimeyi geçmesin. Haber hakkında merak uyandıracak ve okuyucuyu içeriğe yönlendirecek anahtar kelimeler içer. Öne çıkan olayları ve konuları basit, net bir dille ifade et.  Cümleler kısa ve öz olsun, karmaşık yapılardan kaçın. Başlıklarda belirsiz özne kullanarak gizem yarat, doğrudan ve çekici bir mesaj ver.
-
-Haber metninden yola çıkarak EN AZ 5 FARKLI başlık önerisi sun. Her bir başlık haberin farklı yönlerini vurgulayan çeşitli açılardan yaklaşmalı.
-
-SPOT
-
-Spot, başlıkla uyumlu ve haberin ana detaylarını özetler nitelikte olmalı. 1-2 cümle içinde kim, ne, nerede, ne zaman, nasıl, neden gibi soruların cevaplarını ver. Okuyucunun ilgisini çekecek ancak haberin tamamını açık etmeyecek bir dil kullan. Doğal şekilde anahtar kelimeler içermeli ve SEO uyumlu olmalı.
-
-HABER METNİ
-
-XXXXXXX yazarı XXXXXXX XXXXXX "YYYYYYY  YYYYYYYY’ başlıklı köşesinde çok önemli noktalara dikkat çekti. 
-
-Bu köşe yazısını daha etkili sunabilmek için "dedi", "ifadelerini kullandı", "söyledi", "vurguladı", "aktardı", "diye yazdı", "dile getirdi", "açıkladı", "belirtti", "öne çıkardı", "altını çizdi", "şu sözlere yer verdi", "değindi", "işaret etti", "şunu kaydetti", "gündeme taşıdı" ve benzeri ifadeleri çeşitli şekillerde kullanarak habere metnine dönüştür. 
-
-Kritik noktaları ve özel isimleri bold yap.
-
-Aktif cümle yapıları kullan. Pasif yapılardan kaçın. Bu sayede daha dinamik ve doğrudan cümleler oluştur. 
-
-SEO kurallarına uy. Anahtar kelime yoğunluğuna dikkat et. Meta açıklamaları, başlıklar ve alt başlıkları doğru kullan.
-
-Metne dışarıdan yorum ya da sonuç ekleme.
-
-Context: {context}
-"""
-
-
-
-
-# New prompt for "HABERİ YENİDEN YAZMA"
-haberi_yeniden_yazma_prompt = """
-Bu metni intihalden tamamen kurtararak habere dönüştür. Başlık, spot ve haber metni şeklinde. 
-Ara başlıkları büyük harflerle yaz. Kritik noktaları ve özel isimleri bold yap. Cümleler 12 kelimeyi geçmesin.
-Aktif cümle yapıları kullan, pasif yapılardan kaçın.
-
-BAŞLIK YAZMA
-
-1-Volkan Demirel son noktayı koydu!
-2-Adana Demirspor yine eli boş döndü!
-3-Volkan kritik teklifi kabul etmedi!
-4-Aziz Yıldırım Okan Buruk'la ne konuştu. Ortaya çıktı
-5-Fenerbahçe'de Mourinho'yu şok eden ayrılık. Bırakıp gitti
-6-Mourinho'dan flaş Ali Koç ve derbi açıklaması. Saygısızlık yapıldı
-7-Dursun Özbek Mourinho'ya 'Yatarak' karşılık verdi
-8-Hacıosmanoğlu Ali Koç'a küçük dilini yutturdu
-9-Acun Ilıcalı Bayramiç'te sessiz sedasız çalışmalara başladı
-10-Böyle şike görülmedi. 4-1 yenilmesi gerekiyordu 4-1 yenildi
-11-Ebrar Karakurt Rusya'yı ayağa kaldırdı. Yok artık
-12-Merkezefendi maça çıkarmadan gönderdi
-13-Arda Güler 15 dakikada Ancelotti'yi kurtardı
-14-Mustafa Denizli imzayı attı
-15-Sergen Yalçın yeni adresini açıkladı
-16-Mustafa Sarıgül hastaneye koştu. Serhat Akın'ın odasından ilk videoyu paylaştı
-17-Van Bronckhorst maçı sattı mı? Sırrı maçtan önce söylediklerinde saklı
-18-Temmuz'da kıyamet kopacak!
-19-Yüzde 50 zam geldi. Yarından itibaren geçerli!
-20-Emekli zil takıp oynayacak! Bayram ikramiyesi netleşti, Nisan’da hesaplara yatacak
-21-Kuyumcular Artık Satın Almıyor. 81 İlde Altın İçin Yeni Uygulama Başlıyor
-22-Dolarda gece yarısı vurgununu kim yaptı?
-23-Parasını Altında Tutanlara Kötü Haber
-24-Altın İthalatında Yıllar Sonra Bir İlk
-25-Yarın Sabah Başlıyor. Altın Fiyatlarında Haftalar Sonra Bir İlk Yaşanacak
-26-İflas eden ünlü iş insanı hurdacılık yaparken görüntülendi
-27-Altın Sahiplerine Soğuk Duş. Hazırlığa Başlayın
-28-Merkez Bankası'ndan Yeni Döviz Kararı. Dolar Kurunu Altüst Edecek
-29-Koç Ailesine Büyük Darbe. Bir Haftada 150 Milyon Dolar Kaybettiler
-30-Yarından sonra fiyatlar değişti. Bir zam daha geldi
-31-Eşinin aldattığından şüpheleniyordu. Gizli kamera ile eşini kaydeden adam utancından yerin dibine girdi
-32-Perdelerini kapatmayı unutan çiftin rezil olduğu anlar kamerada! Sosyal medyada izlenme rekorları kırdı
-33-Kocasıyla ilişkiye girdiği sırada yanlışlıkla canlı yayın açtı, babası dahil 45 kişi izledi
-34-Meğer onlardan kurtulmak çok kolaymış: Sivrisineklerden jet hızından kurtulmanın tüyosu belli oldu
-35-19 ülkeden 34 kişiyle flört eden gezgin kadın Türkiye'de yaşadıklarını anlattı
-36-Çocuğunuz Bu Ayda Doğmuşsa Dahi Olabilir!
-37-Bu meşrubatı sakın içmeyin, bağışıklık sistemini paramparça yapıyor! Canan Karatay ısrarla uyardı
-38-Sakın Çöpe Atmayın! Değerini Öğrenince Çok Şaşıracaksınız
-39-Ünlü türkücü, Türkiye'yi terk etti! İsviçre'de köy hayatı yaşıyor
-40-Bilenler Nüfus Müdürlüğü'ne Akın Ediyor. Üstelik Bedava Ve Sadece 5 Dakikada İşlem Hallediliyor
-41-T.C Kimlik Numarasını Ezbere Bilenlerin Tamamını İlgilendiriyor
-42-Bildiğiniz duaları unutun. Teravih namazında dağıtılan suların üstündeki not görenleri hayrete düşürdü
-43-Aziz Yıldırım Galatasaray'ı kurtaracak
-44-Fenerbahçe 49 topu kaptı
-45-Muslera'nın zamanı doluyor
-46-Ali Koç ünlü doktoru duyunca ağzı açık kaldı 
-
-Yukarıdaki 46 örnekteki başlıklar, haberlerde birbirinden bağımsız iki konuyu 3-4 kelimeyle, nokta ile ayırıyor. İlk bölümü öznelerin tepkilerine, hareketlerine veya duygularına odaklıyor Bu şekilde okuyucunun dikkatini çekiyor. Yeni yazdığın haberden bu başlık örneklerine benzer 5 adet dikkat çekici ve belirsiz haber başlığı önerisi sun. Nokta ile ayır.
-
-Context: {context}
-
-"""
-
 # Add selection for choosing the prompt, including the new option "HABERİ YENİDEN YAZMA"
 prompt_option = st.radio(
     "Select Prompt:",
-    ("SEO Content Generator", "BİR METİNDEN HABER YAZMA", "BİRDEN FAZLA METİNDEN HABER YAZMA", "KÖŞE YAZISINDAN HABER YAZMA", "HABERİ YENİDEN YAZMA")
+    tuple(PROMPTS)
 )
 
 # Set default prompt based on the user's selection
-if prompt_option == "SEO Content Generator":
-    selected_prompt = seo_content_prompt
-elif prompt_option == "BİR METİNDEN HABER YAZMA":
-    selected_prompt = bir_metinden_haber_prompt
-elif prompt_option == "BİRDEN FAZLA METİNDEN HABER YAZMA":
-    selected_prompt = birden_fazla_metinden_haber_prompt
-elif prompt_option == "KÖŞE YAZISINDAN HABER YAZMA":
-    selected_prompt = kose_yazisindan_haber_prompt
-else:
-    # If "HABERİ YENİDEN YAZMA" is selected
-    selected_prompt = haberi_yeniden_yazma_prompt
+selected_prompt = PROMPTS[prompt_option]
 
 # Initialize a variable to store the user-updated prompt
 updated_prompt = st.text_area("Modify the prompt as needed:", value=selected_prompt, height=500)
 
 # Define the prompt template
-prompt = ChatPromptTemplate.from_template(updated_prompt)
+prompt = compile_prompt(updated_prompt)
 
 # Initialize a variable to store the context (retrieved documents or provided content)
 context_content = ""
 
+# Function to fit source texts into the selected model's context budget and report the savings.
+# With several outputs the context is shared, so it must fit the longest of their prompts.
+def build_context(texts):
+    budget = min(context_budget(model_option, max_tokens, template) for _, template, _, _ in planned_outputs())
+    with run_trace.stage("context_assembly") as record:
+        context, stats = assemble_context(texts, budget)
+        record.update(stats)
+    if stats["output_tokens"] < stats["input_tokens"]:
+        st.caption(
+            f"Context trimmed to fit {model_option}: ~{stats['input_tokens']} → ~{stats['output_tokens']} tokens."
+        )
+    return context
+
+# Local embedding model for chunk retrieval, loaded once per server process.
+# The retrieval stack (sentence-transformers, Chroma) is only imported when it is first used.
+@st.cache_resource
+def get_embeddings():
+    from retrieval import create_embeddings
+    return create_embeddings(create_embedding_cache())
+
+# Function to narrow SEO sources down to the chunks most relevant to the topic, when enabled
+def select_relevant(texts):
+    if not use_retrieval or not user_query:
+        return texts
+    from retrieval import retrieve_relevant_chunks
+    with run_trace.stage("chunk_retrieval", k=retrieval_k):
+        return retrieve_relevant_chunks(texts, user_query, get_embeddings(), retrieval_k)
+
+# Function to collapse near-duplicate sources (e.g. syndicated agency copies) and repeated paragraphs
+def collapse_duplicates(texts):
+    with run_trace.stage("dedupe", sources=len(texts)) as record:
+        texts, stats = dedupe_sources(texts)
+        record.update(stats)
+    if stats["tokens_saved"] > 0:
+        st.caption(
+            f"Collapsed {stats['duplicate_documents']} duplicate sources and {stats['duplicate_paragraphs']} "
+            f"repeated paragraphs: ~{stats['tokens_saved']} tokens saved."
+        )
+    return texts
+
 # Function to format documents into text and store them
 def format_docs(docs):
     global context_content
-    context_content = "\n\n".join(doc.page_content for doc in docs)
+    context_content = build_context(select_relevant(collapse_duplicates([strip_boilerplate_lines(doc.page_content) for doc in docs])))
     return context_content
 
-# Function to load and parse content from URLs
-def load_url_content(urls):
-    if len(urls) == 0 or (len(urls) == 1 and urls[0] == ''):
-        return ""
-    loaders = [WebBaseLoader(url.strip()) for url in urls if url.strip()]
-    documents = []
-    for loader in loaders:
-        docs = loader.load()
-        documents.extend(docs)
-    return "\n\n".join(doc.page_content for doc in documents)
-
-# Define the chain for SEO generation
-def create_seo_chain():
-    return (
-        {"context": RunnablePassthrough(), "konu": RunnablePassthrough()}
-        | prompt
-        | llm
-        | StrOutputParser()
+# Shared HTTP session so URL fetches reuse pooled connections across reruns
+@st.cache_resource
+def get_http_session():
+    return create_http_session(MAX_URL_WORKERS)
+
+# Shared content cache so repeat generations skip downloading and parsing pages
+@st.cache_resource
+def get_url_cache():
+    return create_url_cache()
+
+# Shared search cache so repeated topics don't spend Tavily quota again
+@st.cache_resource
+def get_tavily_cache():
+    return create_tavily_cache()
+
+# Function to search Tavily through the cache and report hits and misses in the page
+def retrieve_tavily_docs(query):
+    with run_trace.stage("tavily_search") as record:
+        docs, cache_hit = search_tavily(retriever, query, get_tavily_cache())
+        record.update(cache_hit=cache_hit, documents=len(docs))
+    counter = "tavily_cache_hits" if cache_hit else "tavily_cache_misses"
+    st.session_state[counter] = st.session_state.get(counter, 0) + 1
+    if cache_hit:
+        st.caption("Tavily results served from cache.")
+    else:
+        st.caption("Tavily results fetched from the API.")
+    return docs
+
+# Shared cache of per-source fact sheets, so swapping one URL only re-condenses that source
+@st.cache_resource
+def get_fact_sheet_cache():
+    return create_fact_sheet_cache()
+
+# Function to build the map step of multi-source news: condense(text) turns one source into a fact sheet
+def make_condenser(config=None):
+    condense_llm = get_llm(model_provider, model_option, 0.0, FACT_SHEET_MAX_TOKENS, provider_api_key)
+    chain = create_non_seo_chain(compile_prompt(fact_sheet_prompt), condense_llm)
+    return lambda text: chain.invoke({"context": fit_source(text, model_option)}, config=config)
+
+# Function to condense the sources into fact sheets in parallel and merge them for the final prompt
+def condense_texts(texts):
+    with run_trace.stage("condense", sources=len(texts)) as record:
+        condense = make_condenser({"callbacks": [run_trace.callback()]})
+        sheets, record["cache_hits"] = condense_sources(texts, condense, f"{model_provider} / {model_option}", get_fact_sheet_cache())
+        merged = merge_fact_sheets(sheets)
+    source_tokens = sum(estimate_tokens(text) for text in texts)
+    st.caption(
+        f"Condensed {len(texts)} sources into fact sheets ({record['cache_hits']} from cache): "
+        f"~{source_tokens} → ~{estimate_tokens(merged)} tokens."
+    )
+    return [merged]
+
+# Function to tell whether this run should condense its sources first (map-reduce)
+def should_condense(texts):
+    return condense_enabled and len(texts) > 1 and all(mode == MULTI_SOURCE_MODE for _, _, mode, _ in planned_outputs())
+
+# Function to tell the user which URLs could not be loaded
+def warn_failed_urls(failed_urls):
+    if failed_urls:
+        st.warning("Could not load these URLs: " + ", ".join(failed_urls))
+
+# Function to build a chain for the selected model, hedged with the fallback model when enabled.
+# Another prompt or temperature can be given for multi-output runs.
+def make_chain(create_chain, chain_prompt=None, chain_temperature=None):
+    chain_prompt = chain_prompt or prompt
+    primary_llm = llm
+    if chain_temperature is not None and chain_temperature != temperature:
+        primary_llm = get_llm(model_provider, model_option, chain_temperature, max_tokens, provider_api_key)
+    primary_chain = create_chain(chain_prompt, primary_llm)
+    if not hedge_enabled:
+        return primary_chain
+    fallback_llm = secondary_llm
+    if chain_temperature is not None and chain_temperature != temperature:
+        fallback_llm = get_llm(secondary_provider, secondary_model, chain_temperature, max_tokens, secondary_api_key)
+    return HedgedChain(
+        [
+            (f"{model_provider} / {model_option}", primary_chain),
+            (f"{secondary_provider} / {secondary_model}", create_chain(chain_prompt, fallback_llm)),
+        ],
+        hedge_after,
     )
 
-# Define the chain for non-SEO generation
-def create_non_seo_chain():
-    return (
-        {"context": RunnablePassthrough()}
-        | prompt
-        | llm
-        | StrOutputParser()
+# Function to stream a chain's output into the page while measuring latency
+def stream_chain(chain, inputs, config=None):
+    stats = {"ttft": None, "tokens": 0}
+    start = time.perf_counter()
+
+    def token_stream():
+        for chunk in chain.stream(inputs, config=config):
+            if stats["ttft"] is None:
+                stats["ttft"] = time.perf_counter() - start
+            # Providers stream roughly one token per chunk
+            stats["tokens"] += 1
+            yield chunk
+
+    result = st.write_stream(token_stream())
+    total = time.perf_counter() - start
+    generation_time = total - (stats["ttft"] or 0.0)
+    tokens_per_second = stats["tokens"] / generation_time if generation_time > 0 else 0.0
+    # A hedged chain reports which model actually answered
+    answered_by = getattr(chain, "route", {}).get("winner", f"{model_provider} / {model_option}")
+    st.session_state.setdefault("latency_log", []).append({
+        "model": answered_by,
+        "ttft_s": round(stats["ttft"] or total, 3),
+        "tokens": stats["tokens"],
+        "tokens_per_s": round(tokens_per_second, 1),
+        "total_s": round(total, 3),
+    })
+    st.caption(
+        f"{answered_by}: first token after {stats['ttft'] or total:.2f}s, "
+        f"{tokens_per_second:.1f} tokens/s, {total:.2f}s total"
     )
+    return result
+
+# Shared response cache so reruns and double clicks don't pay for the same prompt twice
+@st.cache_resource
+def get_response_cache():
+    return create_response_cache()
+
+# Function to tell whether the selected model answered. A hedged chain may have been answered by
+# the fallback model, whose output must not be cached under the selected model's key.
+def answered_by_primary(chain, primary=None):
+    winner = getattr(chain, "route", {}).get("winner")
+    return winner is None or winner == (primary or f"{model_provider} / {model_option}")
+
+# Function to run a chain and render the result, streaming when enabled in the sidebar.
+# With a cache key, the response is replayed from (or stored in) the response cache.
+def run_chain(chain, inputs, header, cache_key=None):
+    st.subheader(header)
+    if cache_key:
+        with run_trace.stage("response_cache") as record:
+            entry = get_response_cache().get(cache_key)
+            record["cache_hit"] = entry is not None
+        if entry:
+            st.write(entry["value"])
+            st.caption("Served from the response cache.")
+            return entry["value"]
+
+    # Prompt rendering and LLM timings are collected through LangChain callbacks
+    config = {"callbacks": [run_trace.callback()]}
+    if stream_output:
+        result = stream_chain(chain, inputs, config)
+    else:
+        result = chain.invoke(inputs, config=config)
+        st.write(result)
+    if cache_key and answered_by_primary(chain):
+        get_response_cache().set(cache_key, result)
+    return result
+
+# Function to repair an output, replaying an earlier repair of the same cached response when there is one.
+# Returns the repaired text, the repair stats and whether they came from the cache.
+def replay_or_repair(response_cache, cache_key, text, repair):
+    repair_key = repair_cache_key(cache_key, text) if response_cache is not None and cache_key else None
+    entry = response_cache.get(repair_key) if repair_key else None
+    if entry:
+        return entry["value"]["text"], entry["value"]["stats"], True
+    repaired, stats = repair()
+    if repair_key:
+        response_cache.set(repair_key, {"text": repaired, "stats": stats})
+    return repaired, stats, False
+
+# Function to check an output against its prompt's rules and, when enabled, repair only the broken parts
+def check_rules(result, mode, inputs, cache_key=None):
+    if not result or not MODE_RULES.get(mode):
+        return result
+    with run_trace.stage("validation") as record:
+        violations = validate_output(result, mode)
+        record["violations"] = len(violations)
+    if not violations:
+        st.caption("All prompt rules are met.")
+        return result
+    with st.expander(f"{len(violations)} rule violations"):
+        for violation in violations:
+            st.markdown(f"- **{violation['rule']}** ({violation['detail']}) {violation['text']}")
+    if not repair_rules:
+        return result
+
+    def repair():
+        with st.spinner("Repairing the broken parts..."):
+            with run_trace.stage("repair") as record:
+                repaired, stats = repair_output(
+                    result, mode, llm, violations, inputs.get("konu") or "", inputs["context"], {"callbacks": [run_trace.callback()]}
+                )
+                record.update(stats)
+        return repaired, stats
+
+    repaired, stats, replayed = replay_or_repair(get_response_cache() if cache_key else None, cache_key, result, repair)
+    st.markdown("**Repaired Content:**")
+    st.write(repaired)
+    if replayed:
+        st.caption("Repair served from the response cache.")
+    else:
+        st.caption(
+            f"Fixed {stats['violations'] - stats['remaining']} of {stats['violations']} violations with "
+            f"{stats['repair_calls']} targeted calls (~{stats['repair_tokens']} tokens)."
+        )
+    return repaired
+
+# Function to spread N variant temperatures from the selected temperature up to 1.0
+def variant_temperatures(count):
+    if count == 1:
+        return [temperature]
+    return [round(temperature + (1.0 - temperature) * index / (count - 1), 2) for index in range(count)]
+
+# Function to list the outputs to generate as (label, prompt template, prompt mode, temperature)
+def planned_outputs():
+    if output_choice == "Several prompts" and fan_out_modes:
+        return [
+            (mode, updated_prompt if mode == prompt_option else PROMPTS[mode], mode, temperature)
+            for mode in fan_out_modes
+        ]
+    if output_choice == "Variants":
+        return [
+            (f"Variant {index} (T={value})", updated_prompt, prompt_option, value)
+            for index, value in enumerate(variant_temperatures(variant_count), start=1)
+        ]
+    return [(None, updated_prompt, prompt_option, temperature)]
+
+# Function to get the chain inputs of a prompt mode
+def output_inputs(mode, context):
+    if mode == SEO_MODE:
+        return {"context": context, "konu": user_query}
+    return {"context": context}
+
+# Function to run several outputs against the same context at once and show them side by side in tabs.
+# The generations run on worker threads (without Streamlit calls); this thread redraws the tabs as
+# their chunks arrive, so the wall time is close to that of the slowest output.
+def run_fan_out(outputs, context, header):
+    st.subheader(header)
+    tabs = st.tabs([label for label, _, _, _ in outputs])
+    placeholders = [tab.empty() for tab in tabs]
+    states = []
+    for label, template, mode, value in outputs:
+        output_prompt = compile_prompt(template)
+        create_chain = create_seo_chain if mode == SEO_MODE else create_non_seo_chain
+        state = {
+            "label": label,
+            "chain": make_chain(create_chain, output_prompt, value),
+            "inputs": output_inputs(mode, context),
+            "parts": [],
+            "done": False,
+            "error": None,
+            "ttft": None,
+            "cached": False,
+            "mode": mode,
+        }
+        if cache_responses:
+            state["cache_key"] = response_cache_key(
+                model_provider, model_option, value, max_tokens, output_prompt.format(**state["inputs"])
+            )
+            entry = get_response_cache().get(state["cache_key"])
+            if entry:
+                state.update(parts=[entry["value"]], done=True, cached=True)
+        states.append(state)
+
+    start = time.perf_counter()
+
+    def generate(state):
+        with run_trace.stage("output", output=state["label"]) as record:
+            try:
+                for chunk in state["chain"].stream(state["inputs"], config={"callbacks": [run_trace.callback()]}):
+                    if state["ttft"] is None:
+                        state["ttft"] = time.perf_counter() - start
+                    state["parts"].append(chunk)
+            except Exception as error:
+                state["error"] = error
+                record["error"] = f"{type(error).__name__}: {error}"
+            finally:
+                state["total"] = time.perf_counter() - start
+                state["done"] = True
+
+    def redraw():
+        for placeholder, state in zip(placeholders, states):
+            if state["error"] is not None:
+                placeholder.error(f"{state['label']} failed: {state['error']}")
+            else:
+                placeholder.markdown("".join(state["parts"]))
+
+    pending = [state for state in states if not state["done"]]
+    if pending:
+        with ThreadPoolExecutor(max_workers=len(pending), thread_name_prefix="fan-out") as executor:
+            for state in pending:
+                executor.submit(generate, state)
+            while not all(state["done"] for state in pending):
+                redraw()
+                time.sleep(0.2)
+    redraw()
+
+    results = {}
+    for tab, state in zip(tabs, states):
+        if state["error"] is not None:
+            continue
+        result = "".join(state["parts"])
+        if state["cached"]:
+            tab.caption("Served from the response cache.")
+        else:
+            if state.get("cache_key") and answered_by_primary(state["chain"]):
+                get_response_cache().set(state["cache_key"], result)
+            answered_by = getattr(state["chain"], "route", {}).get("winner", f"{model_provider} / {model_option}")
+            st.session_state.setdefault("latency_log", []).append({
+                "model": answered_by,
+                "output": state["label"],
+                "ttft_s": round(state["ttft"] or state["total"], 3),
+                "tokens": len(state["parts"]),
+                "total_s": round(state["total"], 3),
+            })
+            tab.caption(f"{answered_by}: first token after {state['ttft'] or state['total']:.2f}s, {state['total']:.2f}s total")
+        with tab:
+            results[state["label"]] = check_rules(result, state["mode"], state["inputs"], state.get("cache_key"))
+    if pending:
+        st.caption(f"{len(outputs)} outputs in {time.perf_counter() - start:.2f}s.")
+    return results
+
+# Function to generate the planned output(s) from the assembled context
+def generate_outputs(context, header):
+    outputs = planned_outputs()
+    if len(outputs) == 1:
+        _, _, mode, _ = outputs[0]
+        chain = make_chain(create_seo_chain if mode == SEO_MODE else create_non_seo_chain)
+        inputs = output_inputs(mode, context)
+        cache_key = None
+        if cache_responses:
+            cache_key = response_cache_key(model_provider, model_option, temperature, max_tokens, prompt.format(**inputs))
+        return check_rules(run_chain(chain, inputs, header, cache_key), mode, inputs, cache_key)
+    return run_fan_out(outputs, context, header)
 
 # Create options for context source
-if prompt_option == "SEO Content Generator":
+if prompt_option == SEO_MODE:
     option = st.radio(
         "Select the source for context information:",
         ("Tavily Search Results", "Manual Context Input", "Paste URLs")
     )
     user_query = st.text_input("Enter the topic for SEO content:")
+    use_retrieval = st.checkbox("Send only the chunks most relevant to the topic", value=False)
+    retrieval_k = st.slider("Relevant chunks", min_value=2, max_value=12, value=RETRIEVAL_TOP_K) if use_retrieval else RETRIEVAL_TOP_K
 else:
     option = st.radio(
         "Select the source for context information:",
         ("Manual Context Input", "Paste URLs")
     )
     user_query = None
+    use_retrieval = False
 
 # Handling the context options
 manual_context = ""
 urls = []
 
-if option == "Tavily Search Results" and prompt_option == "SEO Content Generator":
+if option == "Tavily Search Results" and prompt_option == SEO_MODE:
     st.write("Search results will be retrieved based on the topic.")
     
 elif option == "Manual Context Input":
@@ -387,40 +523,172 @@ elif option == "Manual Context Input":
 elif option == "Paste URLs":
     urls = st.text_area("Paste up to 5 URLs (separated by commas):").split(',')
 
+# Multi-source news can condense each source into a fact sheet before the final prompt
+condense_enabled = False
+if prompt_option == MULTI_SOURCE_MODE and option == "Paste URLs":
+    condense_enabled = st.checkbox(
+        "Condense each source into a fact sheet first",
+        value=True,
+        help="Sources are summarized in parallel (who, what, where, when, quotes) and only the fact sheets go to the final prompt. Keeps long articles within smaller context windows.",
+    )
+
+# Optionally generate several outputs from the same fetched context in one go
+output_choice = st.radio("Outputs:", ("One output", "Several prompts", "Variants"), horizontal=True)
+fan_out_modes = []
+variant_count = 1
+if output_choice == "Several prompts":
+    # SEO needs a topic, which is only asked for when SEO is the selected prompt
+    mode_choices = [mode for mode in PROMPTS if mode != SEO_MODE or prompt_option == SEO_MODE]
+    fan_out_modes = st.multiselect("Prompts to run on the same context:", mode_choices, default=[prompt_option])
+elif output_choice == "Variants":
+    variant_count = st.slider("Variants (temperature spread up to 1.0)", min_value=2, max_value=5, value=3)
+if output_choice != "One output" and background_jobs:
+    st.caption("Multiple outputs are generated in the foreground.")
+run_in_background = background_jobs and output_choice == "One output"
+
 # Control when the content generation happens with a button
 generate_button = st.button("Generate Content")
 
+# Shared worker pool and job table for background generations
+@st.cache_resource
+def get_job_queue():
+    return JobQueue(JOBS_PATH, JOB_WORKERS)
+
+# Function to check the inputs before queueing a background job; warns and returns False if incomplete
+def background_inputs_ready():
+    if prompt_option == SEO_MODE and not user_query:
+        st.warning("Please enter a topic to generate SEO content.")
+        return False
+    if option == "Manual Context Input" and not manual_context:
+        st.warning("Please enter the context information.")
+        return False
+    if option == "Paste URLs" and not any(url.strip() for url in urls):
+        st.warning("Please enter valid URLs.")
+        return False
+    return True
+
+# Function to queue the current request as a background job and return its id.
+# Everything the job needs is captured here; the job itself makes no Streamlit calls.
+def submit_background_job():
+    is_seo = prompt_option == SEO_MODE
+    chain = make_chain(create_seo_chain if is_seo else create_non_seo_chain)
+    budget = context_budget(model_option, max_tokens, updated_prompt)
+    source, topic, manual, job_urls = option, user_query, manual_context, [url.strip() for url in urls if url.strip()]
+    job_retriever = retriever if source == "Tavily Search Results" else None
+    embeddings, k = (get_embeddings(), retrieval_k) if is_seo and use_retrieval and topic else (None, None)
+    condense = make_condenser() if condense_enabled and prompt_option == MULTI_SOURCE_MODE else None
+    fact_sheet_cache = get_fact_sheet_cache()
+    session, url_cache, tavily_cache = get_http_session(), get_url_cache(), get_tavily_cache()
+    response_cache = get_response_cache() if cache_responses else None
+    job_prompt, cache_settings = prompt, (model_provider, model_option, temperature, max_tokens)
+    job_llm, repair = llm, repair_rules
+    model = f"{model_provider} / {model_option}"
+    params = {"mode": prompt_option, "source": source, "topic": topic, "urls": job_urls, "model": model}
+
+    def work(job):
+        trace = RunTrace(job_id=job.job_id, mode=prompt_option, source=source, model=model)
+        job.set_stage("Loading sources")
+        if source == "Tavily Search Results":
+            with trace.stage("tavily_search") as record:
+                docs, record["cache_hit"] = search_tavily(job_retriever, topic, tavily_cache)
+            texts = [strip_boilerplate_lines(doc.page_content) for doc in docs]
+        elif source == "Paste URLs":
+            with trace.stage("url_fetch", urls=len(job_urls)) as record:
+                texts, failed_urls = load_url_texts(job_urls, session, url_cache)
+                record["failed_urls"] = len(failed_urls)
+            job.set_meta(failed_urls=failed_urls)
+        else:
+            texts = [manual]
+        if source != "Manual Context Input":
+            with trace.stage("dedupe", sources=len(texts)) as record:
+                texts, stats = dedupe_sources(texts)
+                record.update(stats)
+            job.set_meta(tokens_saved=stats["tokens_saved"])
+        if condense is not None and len(texts) > 1:
+            job.set_stage("Condensing sources")
+            with trace.stage("condense", sources=len(texts)) as record:
+                sheets, record["cache_hits"] = condense_sources(texts, condense, model, fact_sheet_cache)
+            texts = [merge_fact_sheets(sheets)]
+        if embeddings is not None:
+            from retrieval import retrieve_relevant_chunks
+            with trace.stage("chunk_retrieval", k=k):
+                texts = retrieve_relevant_chunks(texts, topic, embeddings, k)
+        with trace.stage("context_assembly") as record:
+            context, stats = assemble_context(texts, budget)
+            record.update(stats)
+        if not context:
+            raise ValueError("No context could be loaded from the sources.")
+
+        job.set_stage("Generating")
+        inputs = {"context": context, "konu": topic} if is_seo else {"context": context}
+        cache_key = response_cache_key(*cache_settings, job_prompt.format(**inputs)) if response_cache else None
+        entry = response_cache.get(cache_key) if cache_key else None
+        if entry:
+            job.append(entry["value"])
+            job.set_meta(cached=True)
+        else:
+            for chunk in chain.stream(inputs, config={"callbacks": [trace.callback()]}):
+                job.append(chunk)
+            if cache_key and answered_by_primary(chain, model):
+                response_cache.set(cache_key, job.text())
+        text = job.text()
+        violations = validate_output(text, prompt_option)
+        job.set_meta(violations=[f"{violation['rule']} ({violation['detail']}) {violation['text']}" for violation in violations])
+        if violations and repair:
+            job.set_stage("Repairing")
+
+            def repair_text():
+                with trace.stage("repair") as record:
+                    repaired, stats = repair_output(
+                        text, prompt_option, job_llm, violations, topic or "", context, {"callbacks": [trace.callback()]}
+                    )
+                    record.update(stats)
+                return repaired, stats
+
+            text, stats, replayed = replay_or_repair(response_cache, cache_key, text, repair_text)
+            job.set_meta(repair=dict(stats, replayed=replayed))
+        job.set_meta(run=trace.finish())
+        return text
+
+    return get_job_queue().submit(params, work)
+
+# Queue the request as a background job when that mode is on
+if generate_button and run_in_background:
+    if background_inputs_ready():
+        job_id = submit_background_job()
+        st.session_state.setdefault("job_ids", []).append(job_id)
+        st.success(f"Queued job {job_id}. You can keep working; the result appears below.")
+
 # Proceed with content generation only when the button is pressed
-if generate_button:
-    if prompt_option == "SEO Content Generator":
+if generate_button and not run_in_background:
+    # Per-stage timings of this run, written to the metrics file once it is done
+    run_trace = RunTrace(mode=prompt_option, source=option, model=f"{model_provider} / {model_option}")
+    if prompt_option == SEO_MODE:
         if option == "Tavily Search Results":
             if user_query:
                 with st.spinner("Generating SEO content..."):
-                    context_content = format_docs(retriever.get_relevant_documents(user_query))
-                    chain = create_seo_chain()
-                    result = chain.invoke({"context": context_content, "konu": user_query})
-                    st.subheader("Generated SEO Content:")
-                    st.write(result)
+                    context_content = format_docs(retrieve_tavily_docs(user_query))
+                    result = generate_outputs(context_content, "Generated SEO Content:")
             else:
                 st.warning("Please enter a topic to generate SEO content.")
         elif option == "Manual Context Input" and manual_context:
             if user_query:
                 with st.spinner("Generating SEO content..."):
-                    chain = create_seo_chain()
-                    result = chain.invoke({"context": manual_context, "konu": user_query})
-                    st.subheader("Generated SEO Content:")
-                    st.write(result)
+                    context_content = build_context(select_relevant([manual_context]))
+                    result = generate_outputs(context_content, "Generated SEO Content:")
             else:
                 st.warning("Please enter both context and topic.")
         elif option == "Paste URLs" and urls:
             if user_query:
                 with st.spinner("Generating SEO content from URLs..."):
-                    context_content = load_url_content(urls)
+                    with run_trace.stage("url_fetch", urls=len(urls)) as record:
+                        texts, failed_urls = load_url_texts(urls, get_http_session(), get_url_cache())
+                        record["failed_urls"] = len(failed_urls)
+                    warn_failed_urls(failed_urls)
+                    texts = collapse_duplicates(texts)
+                    context_content = build_context(select_relevant(texts))
                     if context_content:
-                        chain = create_seo_chain()
-                        result = chain.invoke({"context": context_content, "konu": user_query})
-                        st.subheader("Generated SEO Content:")
-                        st.write(result)
+                        result = generate_outputs(context_content, "Generated SEO Content:")
                     else:
                         st.warning("Please enter valid URLs.")
             else:
@@ -429,21 +697,95 @@ if generate_button:
         # For non-SEO prompts, including the new "HABERİ YENİDEN YAZMA"
         if option == "Manual Context Input" and manual_context:
             with st.spinner("Generating content..."):
-                chain = create_non_seo_chain()
-                result = chain.invoke({"context": manual_context})
-                st.subheader("Generated Content:")
-                st.write(result)
+                context_content = build_context([manual_context])
+                result = generate_outputs(context_content, "Generated Content:")
         elif option == "Paste URLs" and urls:
             with st.spinner("Generating content from URLs..."):
-                context_content = load_url_content(urls)
+                with run_trace.stage("url_fetch", urls=len(urls)) as record:
+                    texts, failed_urls = load_url_texts(urls, get_http_session(), get_url_cache())
+                    record["failed_urls"] = len(failed_urls)
+                warn_failed_urls(failed_urls)
+                texts = collapse_duplicates(texts)
+                if should_condense(texts):
+                    texts = condense_texts(texts)
+                context_content = build_context(texts)
                 if context_content:
-                    chain = create_non_seo_chain()
-                    result = chain.invoke({"context": context_content})
-                    st.subheader("Generated Content:")
-                    st.write(result)
+                    result = generate_outputs(context_content, "Generated Content:")
                 else:
                     st.warning("Please enter valid URLs.")
 
+    st.session_state["last_run"] = run_trace.finish()
+
+# Background jobs of this session, refreshed every few seconds without rerunning the page
+@st.fragment(run_every=2)
+def show_background_jobs():
+    job_ids = st.session_state.get("job_ids", [])
+    if not job_ids:
+        return
+    st.subheader("Background Jobs")
+    for job in get_job_queue().list(job_ids):
+        params = job["params"]
+        title = f"{job['id']} · {params['mode']} · {job['status']}"
+        with st.expander(title, expanded=job["id"] == job_ids[-1]):
+            if job["status"] == QUEUED:
+                st.caption(f"Waiting for a worker ({get_job_queue().position(job['id'])} jobs ahead).")
+            elif job["status"] not in (DONE, FAILED):
+                st.caption(f"{job['stage'] or 'Starting'}…")
+            if job["meta"].get("failed_urls"):
+                st.warning("Could not load these URLs: " + ", ".join(job["meta"]["failed_urls"]))
+            if job["status"] == FAILED:
+                st.error(job["error"])
+            st.write(job["result"] or job["partial"] or "")
+            if job["meta"].get("cached"):
+                st.caption("Served from the response cache.")
+            if job["meta"].get("tokens_saved"):
+                st.caption(f"~{job['meta']['tokens_saved']} tokens saved by collapsing duplicate sources.")
+            if job["meta"].get("violations"):
+                st.caption(f"{len(job['meta']['violations'])} rule violations:")
+                st.markdown("\n".join(f"- {violation}" for violation in job["meta"]["violations"]))
+            if job["meta"].get("repair"):
+                stats = job["meta"]["repair"]
+                if stats["replayed"]:
+                    st.caption("The text above was repaired; the repair was served from the response cache.")
+                else:
+                    st.caption(
+                        f"The text above was repaired: {stats['violations'] - stats['remaining']} of {stats['violations']} "
+                        f"violations fixed with {stats['repair_calls']} targeted calls (~{stats['repair_tokens']} tokens)."
+                    )
+            if job["meta"].get("run"):
+                st.caption(f"Finished in {job['meta']['run']['total_s']:.2f}s.")
+
+show_background_jobs()
+
+# Open an earlier job (e.g. from another tab or before a reload) by its id
+with st.expander("Open Background Job"):
+    lookup_id = st.text_input("Job ID:")
+    if lookup_id:
+        if get_job_queue().get(lookup_id.strip()) is None:
+            st.warning("No job with this ID.")
+        elif lookup_id.strip() not in st.session_state.get("job_ids", []):
+            st.session_state.setdefault("job_ids", []).append(lookup_id.strip())
+            st.rerun()
+
 # Expander to show retrieved or input context (documents or provided content)
 with st.expander("Context Details"):
     st.write(context_content)
+
+# Expander with the per-stage timing breakdown of the last run
+if st.session_state.get("last_run"):
+    last_run = st.session_state["last_run"]
+    with st.expander("Run Breakdown"):
+        st.caption(f"Run {last_run['run_id']}: {last_run['total_s']:.2f}s total")
+        st.dataframe(last_run["stages"])
+
+# Tavily cache statistics for this session
+if "tavily_cache_hits" in st.session_state or "tavily_cache_misses" in st.session_state:
+    st.sidebar.caption(
+        f"Tavily cache: {st.session_state.get('tavily_cache_hits', 0)} hits, "
+        f"{st.session_state.get('tavily_cache_misses', 0)} misses"
+    )
+
+# Expander to compare streaming latency across providers and models
+if st.session_state.get("latency_log"):
+    with st.expander("Streaming Latency"):
+        st.dataframe(st.session_state["latency_log"])
@@ -0,0 +1,310 @@
+"""Headless batch generation.
+
+Reads jobs from a JSONL file and appends one JSON result per line to the output file
+as soon as each job finishes. Every job uses the same prompts and chains as the app:
+
+    {"id": "haber-1", "mode": "BİR METİNDEN", "urls": ["https://..."]}
+    {"id": "seo-7", "mode": "SEO", "topic": "altın fiyatları", "context": "..."}
+
+SEO jobs without context or URLs search Tavily for the topic. Near-duplicate sources and
+repeated paragraphs are collapsed first. BİRDEN FAZLA jobs with several URLs condense each
+source into a cached fact sheet (set "condense": false to send the full texts). Jobs can
+override the provider and model given on the command line. Every result is checked against
+its prompt's rules; with --repair only the broken sentences and sections are re-prompted.
+Re-running with the same output file skips every job that already finished successfully,
+so a crash does not repeat work.
+
+    python batch.py jobs.jsonl results.jsonl --provider Groq --concurrency 4
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from langchain_core.prompts import ChatPromptTemplate
+
+from budget import assemble_context, context_budget, estimate_tokens
+from condense import condense_sources, fit_source, merge_fact_sheets
+from config import FACT_SHEET_MAX_TOKENS
+from dedupe import dedupe_sources
+from extract import strip_boilerplate_lines
+from pipeline import (
+    PROVIDER_MODELS,
+    build_llm,
+    build_retriever,
+    create_fact_sheet_cache,
+    create_non_seo_chain,
+    create_seo_chain,
+    create_tavily_cache,
+    create_url_cache,
+)
+from prompts import MULTI_SOURCE_MODE, PROMPTS, SEO_MODE, fact_sheet_prompt, resolve_mode
+from sources import MAX_URL_WORKERS, create_http_session, load_url_texts, search_tavily
+from validate import repair_output, validate_output
+
+# Default request and token limits per minute for each provider
+DEFAULT_LIMITS = {
+    "Groq": {"rpm": 30, "tpm": 6000},
+    "OpenAI": {"rpm": 500, "tpm": 30000},
+}
+
+# Environment variables holding the API keys
+API_KEY_ENV = {"Groq": "GROQ_API_KEY", "OpenAI": "OPENAI_API_KEY"}
+
+# Longest wait between re-checks of a full rate limit window, in seconds
+LIMIT_CHECK_INTERVAL = 1.0
+
+
+# Sliding one-minute window limiting requests and tokens per minute.
+# Token reservations are made up front and corrected once the real size is known.
+class RateLimiter:
+    def __init__(self, rpm, tpm):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.window = deque()
+        self.condition = threading.Condition()
+
+    def _prune(self, now):
+        while self.window and now - self.window[0][0] >= 60:
+            self.window.popleft()
+
+    # Blocks until the request fits in the window; returns the reservation.
+    # Waiters wake when a reservation is corrected and re-check the window at least every second.
+    def acquire(self, tokens):
+        tokens = min(tokens, self.tpm)
+        with self.condition:
+            while True:
+                now = time.monotonic()
+                self._prune(now)
+                used = sum(entry[1] for entry in self.window)
+                if len(self.window) < self.rpm and used + tokens <= self.tpm:
+                    entry = [now, tokens]
+                    self.window.append(entry)
+                    return entry
+                expires = 60 - (now - self.window[0][0]) if self.window else LIMIT_CHECK_INTERVAL
+                self.condition.wait(min(max(expires, 0.01), LIMIT_CHECK_INTERVAL))
+
+    # Replaces a reservation's estimate with the tokens actually used
+    def record(self, entry, tokens):
+        with self.condition:
+            entry[1] = min(tokens, self.tpm)
+            self.condition.notify_all()
+
+
+# Function to read jobs from a JSONL file; jobs without an id get their line number
+def read_jobs(path):
+    jobs = []
+    with open(path, encoding="utf-8") as file:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            job = json.loads(line)
+            job.setdefault("id", str(line_number))
+            job["id"] = str(job["id"])
+            jobs.append(job)
+    return jobs
+
+
+# Function to collect the ids of jobs that already succeeded in a previous run
+def read_completed_ids(path):
+    completed = set()
+    if not os.path.exists(path):
+        return completed
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A crash can leave a half-written last line behind
+                continue
+            if record.get("status") == "ok":
+                completed.add(str(record["id"]))
+    return completed
+
+
+# Function to pick a job's provider and model. A job that only switches provider gets that
+# provider's first model; unknown providers and mismatched models fail before any network call.
+def resolve_model(job, default_provider, default_model):
+    provider = job.get("provider", default_provider)
+    if provider not in PROVIDER_MODELS:
+        raise ValueError(f"Unknown provider {provider!r}; expected one of {', '.join(PROVIDER_MODELS)}")
+    model = job.get("model") or (default_model if provider == default_provider else PROVIDER_MODELS[provider][0])
+    if model not in PROVIDER_MODELS[provider]:
+        models = ", ".join(PROVIDER_MODELS[provider])
+        raise ValueError(f"{provider} has no model {model!r}; expected one of {models}")
+    return provider, model
+
+
+class BatchRunner:
+    def __init__(self, provider, model, temperature, max_tokens, limits, repair=False):
+        self.provider = provider
+        self.model = model
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.repair = repair
+        self.limiters = {name: RateLimiter(**limit) for name, limit in limits.items()}
+        self.prompts = {mode: ChatPromptTemplate.from_template(template) for mode, template in PROMPTS.items()}
+        self.fact_sheet_prompt = ChatPromptTemplate.from_template(fact_sheet_prompt)
+        self.fact_sheet_cache = create_fact_sheet_cache()
+        self.session = create_http_session(MAX_URL_WORKERS)
+        self.url_cache = create_url_cache()
+        self.tavily_cache = create_tavily_cache()
+        self.llms = {}
+        self.lock = threading.Lock()
+
+    def get_llm(self, provider, model, temperature=None, max_tokens=None):
+        key = (provider, model, temperature, max_tokens)
+        with self.lock:
+            if key not in self.llms:
+                api_key = os.getenv(API_KEY_ENV[provider])
+                if not api_key:
+                    raise RuntimeError(f"{API_KEY_ENV[provider]} is not set")
+                self.llms[key] = build_llm(
+                    provider,
+                    model,
+                    self.temperature if temperature is None else temperature,
+                    max_tokens or self.max_tokens,
+                    api_key,
+                )
+            return self.llms[key]
+
+    # Function to condense each source into a fact sheet (map step), within the provider's rate limits
+    def condense(self, texts, provider, model):
+        chain = create_non_seo_chain(self.fact_sheet_prompt, self.get_llm(provider, model, 0.0, FACT_SHEET_MAX_TOKENS))
+        limiter = self.limiters.get(provider)
+
+        def condense_one(text):
+            inputs = {"context": fit_source(text, model)}
+            input_tokens = estimate_tokens(self.fact_sheet_prompt.format(**inputs))
+            reservation = limiter.acquire(input_tokens + FACT_SHEET_MAX_TOKENS) if limiter else None
+            sheet = chain.invoke(inputs)
+            if reservation:
+                limiter.record(reservation, input_tokens + estimate_tokens(sheet))
+            return sheet
+
+        sheets, _ = condense_sources(texts, condense_one, f"{provider} / {model}", self.fact_sheet_cache)
+        return [merge_fact_sheets(sheets)]
+
+    # Function to gather the job's source texts from inline text, URLs or a Tavily search
+    def load_sources(self, job, mode, topic):
+        if job.get("context"):
+            return [job["context"]], []
+        if job.get("urls"):
+            urls = job["urls"]
+            if isinstance(urls, str):
+                urls = urls.split(",")
+            return load_url_texts(urls, self.session, self.url_cache)
+        if mode == SEO_MODE and topic:
+            api_key = os.getenv("TAVILY_API_KEY")
+            if not api_key:
+                raise RuntimeError("TAVILY_API_KEY is not set")
+            retriever = build_retriever(job.get("tavily_k", 2), api_key)
+            docs, _ = search_tavily(retriever, topic, self.tavily_cache)
+            return [strip_boilerplate_lines(doc.page_content) for doc in docs], []
+        raise ValueError("Job needs 'context', 'urls' or (for SEO) a 'topic'")
+
+    def run_job(self, job):
+        start = time.perf_counter()
+        record = {"id": job["id"], "mode": job.get("mode"), "provider": job.get("provider", self.provider)}
+        try:
+            provider, model = resolve_model(job, self.provider, self.model)
+            record.update(provider=provider, model=model)
+            mode = resolve_mode(job.get("mode", ""))
+            topic = job.get("topic")
+            if mode == SEO_MODE and not topic:
+                raise ValueError("SEO jobs need a 'topic'")
+            texts, failed_urls = self.load_sources(job, mode, topic)
+            record["failed_urls"] = failed_urls
+            if len(texts) > 1:
+                texts, stats = dedupe_sources(texts)
+                record["tokens_saved"] = stats["tokens_saved"]
+            if mode == MULTI_SOURCE_MODE and len(texts) > 1 and job.get("condense", True):
+                texts = self.condense(texts, provider, model)
+            context, _ = assemble_context(texts, context_budget(model, self.max_tokens, PROMPTS[mode]))
+            if not context:
+                raise ValueError("No context could be loaded")
+
+            prompt = self.prompts[mode]
+            llm = self.get_llm(provider, model)
+            if mode == SEO_MODE:
+                chain = create_seo_chain(prompt, llm)
+                inputs = {"context": context, "konu": topic}
+            else:
+                chain = create_non_seo_chain(prompt, llm)
+                inputs = {"context": context}
+
+            input_tokens = estimate_tokens(prompt.format(**inputs))
+            limiter = self.limiters.get(provider)
+            reservation = limiter.acquire(input_tokens + self.max_tokens) if limiter else None
+            result = chain.invoke(inputs)
+            if reservation:
+                limiter.record(reservation, input_tokens + estimate_tokens(result))
+
+            violations = validate_output(result, mode)
+            record["violations"] = [f"{violation['rule']}: {violation['detail']}" for violation in violations]
+            if violations and self.repair:
+                result, stats = repair_output(result, mode, llm, violations, topic or "", context, limiter=limiter)
+                record["repair"] = stats
+            record.update(status="ok", result=result)
+        except Exception as error:
+            record.update(status="error", error=f"{type(error).__name__}: {error}")
+        record["elapsed_s"] = round(time.perf_counter() - start, 3)
+        return record
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate content for a JSONL file of jobs.")
+    parser.add_argument("jobs", help="input JSONL file with one job per line")
+    parser.add_argument("output", help="output JSONL file; existing successful jobs are skipped")
+    parser.add_argument("--provider", choices=tuple(PROVIDER_MODELS), default="Groq")
+    parser.add_argument("--model", help="model name (defaults to the provider's first model)")
+    parser.add_argument("--temperature", type=float, default=0.0)
+    parser.add_argument("--max-tokens", type=int, default=3500)
+    parser.add_argument("--concurrency", type=int, default=4, help="jobs running at the same time")
+    parser.add_argument("--repair", action="store_true", help="re-prompt only the parts that break the prompt's rules")
+    for provider, limit in DEFAULT_LIMITS.items():
+        name = provider.lower()
+        parser.add_argument(f"--{name}-rpm", type=int, default=limit["rpm"], help=f"{provider} requests per minute")
+        parser.add_argument(f"--{name}-tpm", type=int, default=limit["tpm"], help=f"{provider} tokens per minute")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    limits = {
+        provider: {"rpm": getattr(args, f"{provider.lower()}_rpm"), "tpm": getattr(args, f"{provider.lower()}_tpm")}
+        for provider in DEFAULT_LIMITS
+    }
+    runner = BatchRunner(
+        args.provider,
+        args.model or PROVIDER_MODELS[args.provider][0],
+        args.temperature,
+        args.max_tokens,
+        limits,
+        repair=args.repair,
+    )
+
+    completed = read_completed_ids(args.output)
+    jobs = [job for job in read_jobs(args.jobs) if job["id"] not in completed]
+    print(f"{len(completed)} jobs already done, {len(jobs)} to run", file=sys.stderr)
+
+    failures = 0
+    with open(args.output, "a", encoding="utf-8") as output, ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        futures = [executor.submit(runner.run_job, job) for job in jobs]
+        for done, future in enumerate(as_completed(futures), start=1):
+            record = future.result()
+            # Write and flush each result right away so it doubles as the resume checkpoint
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            output.flush()
+            if record["status"] != "ok":
+                failures += 1
+            print(f"[{done}/{len(jobs)}] {record['id']}: {record['status']} ({record['elapsed_s']}s)", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
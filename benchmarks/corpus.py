@@ -0,0 +1,76 @@
+import random
+
+# Sentences for generating realistic Turkish news text
+SENTENCES = [
+    "Merkez Bankası faiz kararını perşembe günü açıklayacak.",
+    "Gram altın güne yükselişle başladı ve yatırımcıların ilgisini çekti.",
+    "Ekonomistler, enflasyon verilerinin beklentilerin üzerinde geldiğini söyledi.",
+    "Bakan, yeni düzenlemenin önümüzdeki ay yürürlüğe gireceğini açıkladı.",
+    "Fenerbahçe, deplasmanda oynadığı maçı iki golle kazandı.",
+    "Teknik direktör maçın ardından futbolcularına teşekkür etti.",
+    "İstanbul'da sabah saatlerinde yoğun trafik yaşandı.",
+    "Meteoroloji, hafta sonu için kuvvetli yağış uyarısında bulundu.",
+    "Emekliler, bayram ikramiyesinin hesaplara yatacağı tarihi bekliyor.",
+    "Uzmanlar, kira artışlarının önümüzdeki dönemde yavaşlayacağını belirtti.",
+    "Belediye, ulaşım ücretlerine yüzde yirmi zam yapıldığını duyurdu.",
+    "Borsa İstanbul günü yüzde bir artışla tamamladı.",
+    "Dolar kuru, akşam saatlerinde sınırlı bir düşüş gösterdi.",
+    "Sağlık Bakanlığı, grip vakalarında artış olduğunu açıkladı.",
+    "Milli takım, hazırlık maçında rakibini farklı yendi.",
+    "Valilik, bölgedeki okulların bir gün tatil edildiğini bildirdi.",
+    "Açıklamada, çalışmaların titizlikle sürdürüldüğü vurgulandı.",
+    "Olay yerine çok sayıda sağlık ve itfaiye ekibi sevk edildi.",
+    "Yetkililer, vatandaşların resmi açıklamaları takip etmesini istedi.",
+    "Toplantıya sektör temsilcileri ve akademisyenler katıldı.",
+]
+
+HEADLINES = [
+    "Altın fiyatlarında yeni rekor",
+    "Merkez Bankası kararını verdi",
+    "Derbide kazanan belli oldu",
+    "Emekliye bayram ikramiyesi müjdesi",
+    "Kira artışında yeni dönem",
+]
+
+# Source sizes used by the benchmark (paragraphs per article)
+SIZES = {"small": 6, "large": 40}
+
+
+# Function to generate an article as (headline, paragraphs), the same for the same seed
+def make_article(seed, paragraphs):
+    rng = random.Random(seed)
+    headline = rng.choice(HEADLINES)
+    body = [" ".join(rng.choice(SENTENCES) for _ in range(rng.randint(3, 6))) for _ in range(paragraphs)]
+    return headline, body
+
+
+# Function to render an article as a news page with the usual boilerplate around it
+def make_article_html(seed, paragraphs):
+    headline, body = make_article(seed, paragraphs)
+    rng = random.Random(seed + 1)
+    related = "".join(f'<li><a href="/haber/{rng.randint(1, 999)}">{rng.choice(HEADLINES)}</a></li>' for _ in range(8))
+    comments = "".join(f"<p>{rng.choice(SENTENCES)}</p>" for _ in range(5))
+    paragraphs_html = "".join(f"<p>{paragraph}</p>" for paragraph in body)
+    return (
+        "<!DOCTYPE html><html lang='tr'><head><meta charset='utf-8'><title>" + headline + " | Haber</title>"
+        "<script>window.dataLayer = [];</script><style>body{font-family:sans-serif}</style></head><body>"
+        "<header><nav><ul><li><a href='/'>Ana Sayfa</a></li><li><a href='/gundem'>Gündem</a></li>"
+        "<li><a href='/ekonomi'>Ekonomi</a></li><li><a href='/spor'>Spor</a></li></ul></nav></header>"
+        "<div class='cookie-consent'>Sitemizde çerezler kullanılmaktadır. <button>Kabul et</button></div>"
+        "<main><article><header><h1>" + headline + "</h1></header>"
+        "<div class='share-buttons'><a>Facebook</a><a>Twitter</a><a>WhatsApp</a></div>"
+        "<div itemprop='articleBody'>" + paragraphs_html + "</div></article>"
+        "<section class='related-news'><h3>İlgili Haberler</h3><ul>" + related + "</ul></section>"
+        "<section id='comments'><h3>Yorumlar</h3>" + comments + "</section></main>"
+        "<footer><p>© 2024 Haber. Tüm hakları saklıdır.</p></footer></body></html>"
+    )
+
+
+# Function to render an article as Tavily raw content: plain text with some page leftovers
+def make_article_text(seed, paragraphs):
+    headline, body = make_article(seed, paragraphs)
+    return "\n".join(
+        ["Ana Sayfa", "Gündem", "Ekonomi", "Spor", headline]
+        + body
+        + ["Haberi paylaş", "© 2024 Haber. Tüm hakları saklıdır."]
+    )
@@ -0,0 +1,62 @@
+import time
+
+from langchain_core.documents import Document
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from benchmarks.corpus import SIZES, make_article_text
+
+
+# Chat model stand-in that answers after a fixed time to first token and then
+# streams a fixed number of tokens at a fixed rate, without any network access.
+class FakeChatModel(BaseChatModel):
+    ttft: float = 0.05  # seconds before the first token
+    tokens_per_second: float = 500.0
+    output_tokens: int = 300
+
+    @property
+    def _llm_type(self):
+        return "fake-benchmark"
+
+    @property
+    def _identifying_params(self):
+        return {"model": "fake-benchmark"}
+
+    def _tokens(self):
+        time.sleep(self.ttft)
+        for index in range(self.output_tokens):
+            if index:
+                time.sleep(1 / self.tokens_per_second)
+            yield "kelime "
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        text = "".join(self._tokens())
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        for token in self._tokens():
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+
+# TavilySearchAPIRetriever stand-in returning generated Turkish articles after a fixed latency
+class StubTavilyRetriever:
+    def __init__(self, k=2, include_raw_content=True, latency=0.3, size="small"):
+        self.k = k
+        self.include_raw_content = include_raw_content
+        self.latency = latency
+        self.size = size
+
+    def get_relevant_documents(self, query):
+        time.sleep(self.latency)
+        seed = sum(map(ord, query))
+        return [
+            Document(
+                page_content=make_article_text(seed + index, SIZES[self.size]),
+                metadata={"source": f"https://haber.example/{seed + index}", "title": query},
+            )
+            for index in range(self.k)
+        ]
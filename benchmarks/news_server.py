@@ -0,0 +1,51 @@
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks.corpus import SIZES, make_article_html
+
+
+# Local news site: /haber/<id>?size=small|large&delay=<seconds> serves a generated article page
+# with navigation, cookie banner, related news and comments around it, plus an ETag.
+class NewsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        if not parts.path.startswith("/haber/"):
+            self.send_error(404)
+            return
+        query = parse_qs(parts.query)
+        article_id = int(parts.path.rsplit("/", 1)[-1] or 0)
+        size = query.get("size", ["small"])[0]
+        delay = float(query.get("delay", ["0"])[0])
+        if delay:
+            time.sleep(delay)
+
+        body = make_article_html(article_id, SIZES.get(size, SIZES["small"])).encode("utf-8")
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# Function to start the news site on a free local port; returns the server and its base URL
+def start_news_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), NewsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
@@ -0,0 +1,213 @@
+"""Offline benchmark of the generation pipeline.
+
+Runs every prompt mode against local stand-ins (a fake chat model, a Tavily stub and a
+local news site), for several source counts and sizes, and reports per-stage p50/p95
+latency and throughput. Results are compared with a saved baseline so regressions show
+up before deploying; no API keys or network access are needed.
+
+    python -m benchmarks.run                    # compare with benchmarks/baseline.json
+    python -m benchmarks.run --save-baseline    # record a new baseline
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.prompts import ChatPromptTemplate
+
+from benchmarks.fakes import FakeChatModel, StubTavilyRetriever
+from benchmarks.news_server import start_news_server
+from budget import assemble_context, context_budget
+from cache import SQLiteCache
+from condense import condense_sources, fit_source, merge_fact_sheets
+from dedupe import dedupe_sources
+from extract import strip_boilerplate_lines
+from metrics import RunTrace
+from pipeline import create_non_seo_chain, create_seo_chain
+from prompts import MULTI_SOURCE_MODE, PROMPTS, SEO_MODE, fact_sheet_prompt
+from sources import create_http_session, load_url_texts, search_tavily
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+SOURCE_COUNTS = (1, 3, 5)
+SOURCE_SIZES = ("small", "large")
+TOPIC = "altın fiyatları"
+
+
+# Function to get the nearest-rank percentile of a list of numbers
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+# Every (mode, source, count, size) combination; Tavily is only a source for SEO
+def scenarios(modes):
+    for mode in modes:
+        sources = ("urls", "tavily") if mode == SEO_MODE else ("urls",)
+        for source in sources:
+            for count in SOURCE_COUNTS:
+                for size in SOURCE_SIZES:
+                    yield mode, source, count, size
+
+
+# Function to run the pipeline once, the way the app does, and return its stage timings.
+# Multi-source runs with several sources are condensed into fact sheets first (map-reduce).
+def run_once(args, mode, source, count, size, seed, base_url, session, llm, prompt, fact_sheet_cache=None):
+    trace = RunTrace(mode=mode)
+    if source == "tavily":
+        retriever = StubTavilyRetriever(k=count, latency=args.tavily_latency, size=size)
+        with trace.stage("tavily_search"):
+            docs, _ = search_tavily(retriever, f"{TOPIC} {seed}")
+        texts = [strip_boilerplate_lines(doc.page_content) for doc in docs]
+    else:
+        urls = [f"{base_url}/haber/{seed * 10 + index}?size={size}&delay={args.url_delay}" for index in range(count)]
+        with trace.stage("url_fetch"):
+            texts, _ = load_url_texts(urls, session)
+
+    with trace.stage("dedupe"):
+        texts, _ = dedupe_sources(texts)
+
+    if mode == MULTI_SOURCE_MODE and len(texts) > 1:
+        with trace.stage("condense"):
+            condense_chain = create_non_seo_chain(ChatPromptTemplate.from_template(fact_sheet_prompt), llm)
+            sheets, _ = condense_sources(
+                texts,
+                lambda text: condense_chain.invoke({"context": fit_source(text, args.model)}),
+                f"benchmark / {args.model}",
+                fact_sheet_cache,
+            )
+            texts = [merge_fact_sheets(sheets)]
+
+    with trace.stage("context_assembly"):
+        context, _ = assemble_context(texts, context_budget(args.model, args.max_tokens, PROMPTS[mode]))
+
+    if mode == SEO_MODE:
+        chain = create_seo_chain(prompt, llm)
+        inputs = {"context": context, "konu": TOPIC}
+    else:
+        chain = create_non_seo_chain(prompt, llm)
+        inputs = {"context": context}
+    "".join(chain.stream(inputs, config={"callbacks": [trace.callback()]}))
+
+    timings = {}
+    for stage in trace.stages:
+        timings[stage["stage"]] = timings.get(stage["stage"], 0.0) + stage["duration_s"]
+        if stage["stage"] == "llm" and "ttft_s" in stage:
+            timings["llm_ttft"] = stage["ttft_s"]
+    timings["total"] = time.perf_counter() - trace.start
+    return timings
+
+
+# Function to run one scenario several times and summarize it
+def run_scenario(args, scenario, base_url, session, llm, prompts, fact_sheet_cache=None):
+    mode, source, count, size = scenario
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        runs = list(executor.map(
+            lambda seed: run_once(
+                args, mode, source, count, size, seed, base_url, session, llm, prompts[mode], fact_sheet_cache
+            ),
+            range(args.runs),
+        ))
+    wall = time.perf_counter() - start
+
+    summary = {"throughput_rps": round(len(runs) / wall, 3), "stages": {}}
+    for stage in runs[0]:
+        values = [run[stage] for run in runs if stage in run]
+        summary["stages"][stage] = {"p50": round(percentile(values, 0.5), 4), "p95": round(percentile(values, 0.95), 4)}
+    return summary
+
+
+# Function to list the stages and scenarios that got slower than the baseline.
+# p95 over a handful of runs is noisy, so it gets twice the tolerance and minimum delta of p50.
+def find_regressions(results, baseline, tolerance, min_delta):
+    regressions = []
+    for key, result in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        for stage, stats in result["stages"].items():
+            old = previous["stages"].get(stage)
+            if old is None:
+                continue
+            for metric, scale in (("p50", 1), ("p95", 2)):
+                if stats[metric] > old[metric] * (1 + scale * tolerance) and stats[metric] - old[metric] > scale * min_delta:
+                    regressions.append(f"{key} {stage} {metric}: {old[metric]:.4f}s -> {stats[metric]:.4f}s")
+        if result["throughput_rps"] < previous["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{key} throughput: {previous['throughput_rps']:.3f} -> {result['throughput_rps']:.3f} runs/s"
+            )
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the generation pipeline offline.")
+    parser.add_argument("--runs", type=int, default=8, help="runs per scenario")
+    parser.add_argument("--concurrency", type=int, default=2, help="runs in flight at the same time")
+    parser.add_argument("--modes", nargs="*", default=list(PROMPTS), help="prompt modes to benchmark")
+    parser.add_argument("--model", default="llama3-70b-8192", help="model whose context window sets the budget")
+    parser.add_argument("--max-tokens", type=int, default=3500)
+    parser.add_argument("--llm-ttft", type=float, default=0.05, help="fake model time to first token (s)")
+    parser.add_argument("--llm-tps", type=float, default=1000.0, help="fake model tokens per second")
+    parser.add_argument("--llm-tokens", type=int, default=200, help="fake model tokens per answer")
+    parser.add_argument("--url-delay", type=float, default=0.05, help="local news site response delay (s)")
+    parser.add_argument("--tavily-latency", type=float, default=0.2, help="Tavily stub latency (s)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before flagging")
+    parser.add_argument("--min-delta", type=float, default=0.05, help="ignore slowdowns smaller than this (s)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    server, base_url = start_news_server()
+    session = create_http_session()
+    llm = FakeChatModel(ttft=args.llm_ttft, tokens_per_second=args.llm_tps, output_tokens=args.llm_tokens)
+    prompts = {mode: ChatPromptTemplate.from_template(template) for mode, template in PROMPTS.items()}
+    # Fact sheets go to a throwaway cache, so every benchmark run starts cold
+    cache_dir = tempfile.TemporaryDirectory()
+    fact_sheet_cache = SQLiteCache(os.path.join(cache_dir.name, "fact_sheets.sqlite"), table="fact_sheets")
+
+    results = {}
+    try:
+        # One untimed run so imports and the first connection don't count against the first scenario
+        for mode, source, count, size in scenarios(args.modes):
+            run_once(args, mode, source, count, size, 999, base_url, session, llm, prompts[mode], fact_sheet_cache)
+            break
+        for scenario in scenarios(args.modes):
+            key = "{} | {} x{} {}".format(*scenario)
+            results[key] = run_scenario(args, scenario, base_url, session, llm, prompts, fact_sheet_cache)
+            stages = results[key]["stages"]
+            print(
+                f"{key:<58} {results[key]['throughput_rps']:>6.2f} runs/s  "
+                + "  ".join(f"{stage} {stats['p50']:.3f}/{stats['p95']:.3f}" for stage, stats in stages.items())
+            )
+    finally:
+        server.shutdown()
+        cache_dir.cleanup()
+    print("(stage p50/p95 in seconds)")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(results, file, ensure_ascii=False, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline found; run with --save-baseline to create one.")
+        return 0
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)
+    regressions = find_regressions(results, baseline, args.tolerance, args.min_delta)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    print(f"{len(regressions)} regressions against {args.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+import math
+
+# Context window (in tokens) of every model offered in the app
+MODEL_CONTEXT_WINDOWS = {
+    "llama3-70b-8192": 8192,
+    "llama-3.1-70b-versatile": 131072,
+    "gpt-4o": 128000,
+    "gpt-4o-mini": 128000,
+}
+DEFAULT_CONTEXT_WINDOW = 8192
+
+# Turkish text averages about three characters per token on these tokenizers;
+# erring on the short side keeps the estimate conservative.
+CHARS_PER_TOKEN = 3
+
+# Tokens kept free for the topic, chat formatting and estimation error
+CONTEXT_MARGIN = 256
+
+
+# Function to estimate the number of tokens in a text
+def estimate_tokens(text):
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+# Function to work out how many context tokens fit next to the prompt and the answer
+def context_budget(model, max_tokens, template):
+    window = MODEL_CONTEXT_WINDOWS.get(model, DEFAULT_CONTEXT_WINDOW)
+    return max(window - max_tokens - estimate_tokens(template) - CONTEXT_MARGIN, 0)
+
+
+# Function to cut a text down to a token budget, preferring paragraph boundaries
+def fit_text(text, budget):
+    if estimate_tokens(text) <= budget:
+        return text
+    kept = []
+    used = 0
+    for paragraph in text.split("\n\n"):
+        cost = estimate_tokens(paragraph) + 1
+        if used + cost > budget:
+            if not kept:
+                # Not even the first paragraph fits: cut it at the last whole word
+                return paragraph[:budget * CHARS_PER_TOKEN].rsplit(" ", 1)[0]
+            break
+        kept.append(paragraph)
+        used += cost
+    return "\n\n".join(kept)
+
+
+# Function to assemble several source texts into one context within a token budget.
+# Every source gets a fair share; whatever short sources leave unused goes to the longer ones.
+# Returns the context (sources in their original order) and the estimated tokens before/after.
+def assemble_context(texts, budget):
+    texts = [text.strip() for text in texts if text.strip()]
+    input_tokens = sum(estimate_tokens(text) for text in texts)
+    if input_tokens <= budget:
+        context = "\n\n".join(texts)
+        return context, {"input_tokens": input_tokens, "output_tokens": input_tokens}
+
+    shares = {}
+    remaining = budget
+    order = sorted(range(len(texts)), key=lambda index: estimate_tokens(texts[index]))
+    for position, index in enumerate(order):
+        share = remaining // (len(order) - position)
+        shares[index] = min(estimate_tokens(texts[index]), share)
+        remaining -= shares[index]
+
+    fitted = [fit_text(text, shares[index]) for index, text in enumerate(texts)]
+    context = "\n\n".join(text for text in fitted if text)
+    return context, {"input_tokens": input_tokens, "output_tokens": estimate_tokens(context)}
@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+# Keys per SELECT in batched lookups, below SQLite's limit on query parameters
+SQL_BATCH_SIZE = 500
+
+
+# Small JSON key/value store on top of SQLite with TTL and size-bounded LRU eviction.
+# Every call opens its own connection, so one instance can be shared between threads.
+class SQLiteCache:
+    def __init__(self, path, table="cache", ttl=None, max_bytes=None, keep_stale=False):
+        # ttl: seconds an entry stays fresh (None = forever)
+        # max_bytes: total size of stored values before least recently used entries are evicted
+        # keep_stale: keep expired entries (e.g. for HTTP revalidation) instead of purging them
+        self.path = path
+        self.table = table
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.keep_stale = keep_stale
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, meta TEXT, size INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_accessed ON {self.table} (accessed_at)")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _is_fresh(self, created_at, now):
+        return self.ttl is None or now - created_at < self.ttl
+
+    # Returns {"value", "meta", "created_at", "fresh"} or None.
+    # Expired entries are only returned when the cache keeps stale entries.
+    def get(self, key):
+        return self.get_many([key]).get(key)
+
+    # Looks up many keys with one connection and transaction; returns {key: entry} for the keys found
+    def get_many(self, keys):
+        now = time.time()
+        keys = list(dict.fromkeys(keys))
+        entries = {}
+        expired = []
+        with self._connect() as conn:
+            for start in range(0, len(keys), SQL_BATCH_SIZE):
+                batch = keys[start:start + SQL_BATCH_SIZE]
+                rows = conn.execute(
+                    f"SELECT key, value, meta, created_at FROM {self.table} "
+                    f"WHERE key IN ({', '.join('?' * len(batch))})",
+                    batch,
+                ).fetchall()
+                for key, value, meta, created_at in rows:
+                    fresh = self._is_fresh(created_at, now)
+                    if not fresh and not self.keep_stale:
+                        expired.append((key,))
+                        continue
+                    entries[key] = {
+                        "value": json.loads(value),
+                        "meta": json.loads(meta) if meta else {},
+                        "created_at": created_at,
+                        "fresh": fresh,
+                    }
+            conn.executemany(f"DELETE FROM {self.table} WHERE key = ?", expired)
+            conn.executemany(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", [(now, key) for key in entries])
+        return entries
+
+    def set(self, key, value, meta=None):
+        self.set_many({key: value}, meta)
+
+    # Stores many {key: value} items with one connection, one transaction and one eviction pass
+    def set_many(self, items, meta=None):
+        now = time.time()
+        encoded_meta = json.dumps(meta) if meta else None
+        rows = []
+        for key, value in items.items():
+            encoded = json.dumps(value, ensure_ascii=False)
+            rows.append((key, encoded, encoded_meta, len(encoded.encode("utf-8")), now, now))
+        with self._connect() as conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, meta, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._evict(conn, now)
+
+    # Marks an entry as fresh again without rewriting its value (e.g. after an HTTP 304).
+    def touch(self, key):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                f"UPDATE {self.table} SET created_at = ?, accessed_at = ? WHERE key = ?", (now, now, key)
+            )
+
+    def _evict(self, conn, now):
+        if self.ttl is not None and not self.keep_stale:
+            conn.execute(f"DELETE FROM {self.table} WHERE created_at < ?", (now - self.ttl,))
+        if self.max_bytes is None:
+            return
+        total = conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {self.table}").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Drop least recently used entries until the store fits again
+        for key, size in conn.execute(
+            f"SELECT key, size FROM {self.table} ORDER BY accessed_at ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            total -= size
+
+
+# Function to build the LLM response cache key from the model settings and the rendered prompt
+def response_cache_key(provider, model, temperature, max_tokens, rendered_prompt):
+    payload = json.dumps([provider, model, temperature, max_tokens, rendered_prompt], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# Function to build the cache key of a repaired output from its response's key and the text that was repaired
+def repair_cache_key(response_key, text):
+    return hashlib.sha256(f"repair\n{response_key}\n{text}".encode("utf-8")).hexdigest()
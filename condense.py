@@ -0,0 +1,49 @@
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+from budget import context_budget, fit_text
+from config import CONDENSE_WORKERS, FACT_SHEET_MAX_TOKENS
+from prompts import fact_sheet_prompt
+
+
+# Function to build the cache key of a source's fact sheet; the model, prompt and text all count
+def fact_sheet_key(model_label, text):
+    digest = hashlib.sha256()
+    for part in (model_label, fact_sheet_prompt, text):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+# Function to cut one source down so it fits the condensation prompt of the given model
+def fit_source(text, model):
+    return fit_text(text, context_budget(model, FACT_SHEET_MAX_TOKENS, fact_sheet_prompt))
+
+
+# Map step: condense every source into a fact sheet with condense(text), in parallel.
+# Sheets are cached per source, so re-running with one source swapped only re-processes that one.
+# Returns the sheets in source order and how many of them came from the cache.
+def condense_sources(texts, condense, model_label, cache=None, workers=CONDENSE_WORKERS):
+    texts = [text.strip() for text in texts if text.strip()]
+    keys = [fact_sheet_key(model_label, text) for text in texts]
+    sheets = [None] * len(texts)
+    missing = []
+    for index, key in enumerate(keys):
+        entry = cache.get(key) if cache is not None else None
+        if entry:
+            sheets[index] = entry["value"]
+        else:
+            missing.append(index)
+
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(workers, len(missing))) as executor:
+            for index, sheet in zip(missing, executor.map(lambda index: condense(texts[index]), missing)):
+                sheets[index] = sheet.strip()
+                if cache is not None:
+                    cache.set(keys[index], sheets[index])
+    return sheets, len(texts) - len(missing)
+
+
+# Function to merge the fact sheets into the context of the final (reduce) prompt
+def merge_fact_sheets(sheets):
+    return "\n\n".join(f"Kaynak {index}:\n{sheet}" for index, sheet in enumerate(sheets, start=1) if sheet)
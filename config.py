@@ -0,0 +1,48 @@
+import os
+
+from dotenv import load_dotenv
+
+# Load environment variables (API Keys etc.)
+load_dotenv()
+
+# On-disk cache for fetched URL content
+URL_CACHE_PATH = os.getenv("URL_CACHE_PATH", ".cache/content_cache.sqlite")
+URL_CACHE_TTL = int(os.getenv("URL_CACHE_TTL", "3600"))  # seconds before a page is revalidated
+URL_CACHE_MAX_MB = int(os.getenv("URL_CACHE_MAX_MB", "200"))
+
+# Cache for Tavily search results (same SQLite file, separate table)
+TAVILY_CACHE_TTL = int(os.getenv("TAVILY_CACHE_TTL", "21600"))  # seconds a search result is reused
+TAVILY_CACHE_MAX_MB = int(os.getenv("TAVILY_CACHE_MAX_MB", "50"))
+
+# Opt-in cache for generated responses
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", ".cache/llm_cache.sqlite")
+LLM_CACHE_MAX_AGE = int(os.getenv("LLM_CACHE_MAX_AGE", "604800"))  # seconds before a response is dropped
+LLM_CACHE_MAX_MB = int(os.getenv("LLM_CACHE_MAX_MB", "100"))
+
+# Local embedding model and cache for chunk retrieval
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2")
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+EMBEDDING_CACHE_MAX_MB = int(os.getenv("EMBEDDING_CACHE_MAX_MB", "200"))
+RETRIEVAL_TOP_K = int(os.getenv("RETRIEVAL_TOP_K", "6"))  # chunks sent to the SEO prompt
+
+# Near-duplicate source and paragraph detection
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.7"))  # estimated Jaccard similarity of word shingles
+
+# Map-reduce condensation of multi-source news into per-source fact sheets
+FACT_SHEET_MAX_TOKENS = int(os.getenv("FACT_SHEET_MAX_TOKENS", "700"))  # output limit of one fact sheet
+FACT_SHEET_CACHE_MAX_MB = int(os.getenv("FACT_SHEET_CACHE_MAX_MB", "50"))
+CONDENSE_WORKERS = int(os.getenv("CONDENSE_WORKERS", "5"))  # sources condensed at the same time
+
+# Hedged routing between providers
+HEDGE_AFTER = float(os.getenv("HEDGE_AFTER", "3.0"))  # seconds without a first token before hedging
+ROUTING_LOG_PATH = os.getenv("ROUTING_LOG_PATH", ".cache/routing.jsonl")
+
+# Per-run metrics export
+METRICS_PATH = os.getenv("METRICS_PATH", ".cache/metrics.jsonl")
+METRICS_MAX_MB = int(os.getenv("METRICS_MAX_MB", "10"))  # size before the file is rotated
+METRICS_BACKUPS = int(os.getenv("METRICS_BACKUPS", "5"))
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))  # Prometheus-style /metrics endpoint, 0 = off
+
+# Background generation jobs
+JOBS_PATH = os.getenv("JOBS_PATH", ".cache/jobs.sqlite")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))  # generations running at the same time
@@ -0,0 +1,138 @@
+import heapq
+import re
+from collections import Counter
+from itertools import chain
+
+from budget import estimate_tokens
+from config import DEDUP_THRESHOLD
+
+# Words per shingle
+SHINGLE_SIZE = 5
+
+# Hashes kept in a bottom-k MinHash sketch
+SKETCH_SIZE = 64
+
+# Paragraphs with fewer words than this are only collapsed when they match exactly
+MIN_SHINGLED_WORDS = 8
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+# Function to split a source into paragraphs, remembering how they were joined
+def _split_paragraphs(text):
+    separator = "\n\n" if "\n\n" in text else "\n"
+    return [paragraph.strip() for paragraph in text.split(separator) if paragraph.strip()], separator
+
+
+# Function to get the lower-cased words of a text (Turkish İ/I are folded before lowering)
+def _words(text):
+    return _WORD_PATTERN.findall(text.replace("İ", "i").replace("I", "ı").lower())
+
+
+# Function to compute the bottom-k MinHash sketch of a list of words: the SKETCH_SIZE smallest
+# shingle hashes. Returns None for texts too short to shingle. Sketches use Python's string
+# hash, so they are only comparable within one process (they are never stored).
+def sketch(words):
+    if len(words) < MIN_SHINGLED_WORDS:
+        return None
+    hashes = {hash(" ".join(words[index:index + SHINGLE_SIZE])) for index in range(len(words) - SHINGLE_SIZE + 1)}
+    return frozenset(heapq.nsmallest(SKETCH_SIZE, hashes))
+
+
+# Function to estimate the Jaccard similarity of two sketches from the bottom-k of their union
+def similarity(sketch_a, sketch_b):
+    union = heapq.nsmallest(SKETCH_SIZE, sketch_a | sketch_b)
+    return sum(1 for value in union if value in sketch_a and value in sketch_b) / len(union)
+
+
+# Index of sketches. A new item is only compared with items that share enough hashes with it:
+# the similarity estimate can't exceed shared / max(sketch sizes), so others are skipped unseen.
+class _NearDuplicateIndex:
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.postings = {}
+        self.sketches = []
+        self.exact = {}
+
+    # Returns the id of an indexed item this one nearly duplicates, or None
+    def find(self, item_sketch, key):
+        if item_sketch is None:
+            return self.exact.get(key)
+        shared = Counter(chain.from_iterable(self.postings.get(value, ()) for value in item_sketch))
+        for item in sorted(shared):
+            other = self.sketches[item]
+            if shared[item] < self.threshold * max(len(item_sketch), len(other)):
+                continue
+            if similarity(item_sketch, other) >= self.threshold:
+                return item
+        return None
+
+    def add(self, item_sketch, key):
+        item = len(self.sketches)
+        self.sketches.append(item_sketch)
+        if item_sketch is None:
+            self.exact.setdefault(key, item)
+            return item
+        for value in item_sketch:
+            self.postings.setdefault(value, []).append(item)
+        return item
+
+
+# Function to collapse near-duplicate sources and paragraphs before the context is assembled.
+# Syndicated copies of the same document keep only their longest version (in the place of the
+# first copy); then paragraphs repeated across the remaining sources are kept only once.
+# Returns the texts and stats: documents and paragraphs dropped, and estimated tokens before/after.
+def dedupe_sources(texts, threshold=DEDUP_THRESHOLD):
+    sources = []
+    for text in texts:
+        paragraphs, separator = _split_paragraphs(text)
+        if not paragraphs:
+            continue
+        words = [_words(paragraph) for paragraph in paragraphs]
+        sketches = [sketch(paragraph_words) for paragraph_words in words]
+        # The bottom-k of a union is the bottom-k of the parts' sketches
+        shingled = [paragraph_sketch for paragraph_sketch in sketches if paragraph_sketch is not None]
+        document_sketch = frozenset(heapq.nsmallest(SKETCH_SIZE, set().union(*shingled))) if shingled else None
+        sources.append({
+            "paragraphs": paragraphs,
+            "separator": separator,
+            "keys": [" ".join(paragraph_words) for paragraph_words in words],
+            "sketches": sketches,
+            "sketch": document_sketch,
+            "length": len(text),
+        })
+    input_tokens = sum(estimate_tokens(text) for text in texts)
+
+    documents = _NearDuplicateIndex(threshold)
+    kept = []
+    for source in sources:
+        match = documents.find(source["sketch"], " ".join(source["keys"]))
+        if match is None:
+            documents.add(source["sketch"], " ".join(source["keys"]))
+            kept.append(source)
+        elif source["length"] > kept[match]["length"]:
+            kept[match] = source
+    dropped_documents = len(sources) - len(kept)
+
+    paragraphs = _NearDuplicateIndex(threshold)
+    results = []
+    dropped_paragraphs = 0
+    for source in kept:
+        unique = []
+        for paragraph, key, paragraph_sketch in zip(source["paragraphs"], source["keys"], source["sketches"]):
+            if paragraphs.find(paragraph_sketch, key) is not None:
+                dropped_paragraphs += 1
+                continue
+            paragraphs.add(paragraph_sketch, key)
+            unique.append(paragraph)
+        if unique:
+            results.append(source["separator"].join(unique))
+
+    output_tokens = sum(estimate_tokens(text) for text in results)
+    return results, {
+        "duplicate_documents": dropped_documents,
+        "duplicate_paragraphs": dropped_paragraphs,
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "tokens_saved": input_tokens - output_tokens,
+    }
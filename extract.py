@@ -0,0 +1,202 @@
+import re
+
+# Tags that never hold article text
+BOILERPLATE_TAGS = [
+    "script", "style", "noscript", "template", "svg", "iframe", "form",
+    "nav", "header", "footer", "aside", "button", "select", "input",
+]
+
+# Class/id words used by navigation, cookie banners, comments, related lists, ads etc.
+# Names are matched word by word ("related-news", "share_buttons"), never as substrings.
+BOILERPLATE_WORDS = {
+    "cookie", "cookies", "consent", "gdpr", "kvkk", "cerez", "banner", "breadcrumb", "breadcrumbs",
+    "comment", "comments", "yorum", "yorumlar", "related", "ilgili", "benzer", "recommended",
+    "oneri", "oneriler", "share", "sharing", "social", "paylas", "newsletter", "subscribe", "abone",
+    "advert", "advertisement", "ads", "reklam", "sponsor", "sponsored", "promo", "popup", "modal",
+    "menu", "sidebar", "footer", "masthead", "navbar", "nav", "etiket", "etiketler", "tags",
+}
+
+# Leading class/id words that describe a state of the element, not its content ("has-sidebar")
+STATE_PREFIXES = {"has", "with", "without", "no", "is"}
+
+# Whole phrases that make a short line boilerplate on its own in plain text (e.g. Tavily raw content)
+BOILERPLATE_LINE_PATTERN = re.compile(
+    r"\b(?:çerez\w* (?:kullan|kabul|politika)|cookies? (?:policy|settings)|accept cookies|"
+    r"tüm hakları saklıdır|all rights reserved|abone ol|haberi paylaş|yorum yap|giriş yap)",
+    re.IGNORECASE,
+)
+
+# A share bar flattened to text: nothing but two or more platform names
+SHARE_PLATFORMS = r"(?:facebook|twitter|x|whatsapp|instagram|linkedin|telegram|pinterest|e-?posta)"
+SHARE_LINE_PATTERN = re.compile(rf"^{SHARE_PLATFORMS}(?:\W+{SHARE_PLATFORMS})+\W*$", re.IGNORECASE)
+
+# Block elements that make up the article body, in reading order
+BLOCK_TAGS = ["h1", "h2", "h3", "h4", "p", "li", "blockquote"]
+
+# Elements that are kept even if their class/id looks like boilerplate
+PROTECTED_TAGS = {"html", "body", "main", "article"}
+
+MIN_PARAGRAPH_CHARS = 80
+MIN_ARTICLE_CHARS = 200
+SHORT_LINE_WORDS = 4
+BOILERPLATE_LINE_MAX_WORDS = 8
+
+
+def _normalize_space(text):
+    return " ".join(text.split())
+
+
+# Function to add up the text of the real paragraphs under an element
+def _paragraph_chars(tag):
+    lengths = (len(_normalize_space(paragraph.get_text())) for paragraph in tag.find_all("p"))
+    return sum(length for length in lengths if length >= MIN_PARAGRAPH_CHARS)
+
+
+def _is_boilerplate_name(name):
+    words = [word for word in re.split(r"[-_]+", name.lower()) if word]
+    if not words or words[0] in STATE_PREFIXES:
+        return False
+    return any(word in BOILERPLATE_WORDS for word in words)
+
+
+def _is_boilerplate(tag, page_chars):
+    if tag.name in PROTECTED_TAGS:
+        return False
+    names = tag.get("class", []) + [tag.get("id") or ""]
+    if not any(_is_boilerplate_name(name) for name in names):
+        return False
+    # Wrappers around the article itself are not boilerplate, whatever their name
+    if tag.find(["article", "main"]) is not None or tag.find(attrs={"itemprop": "articleBody"}) is not None:
+        return False
+    # Neither is an element holding most of the page's paragraph text
+    return not page_chars or _paragraph_chars(tag) < page_chars / 2
+
+
+# Function to pick the element that holds the article body
+def _find_main_container(soup):
+    bodies = soup.select("[itemprop=articleBody]")
+    if bodies:
+        body = max(bodies, key=lambda tag: len(tag.get_text()))
+        # The enclosing <article> also holds the headline, spot and byline
+        return body.find_parent("article") or body
+    candidates = soup.find_all("article") or soup.find_all("main")
+    if candidates:
+        return max(candidates, key=lambda tag: len(tag.get_text()))
+
+    # Otherwise score every parent by the amount of paragraph text it holds
+    scores = {}
+    for paragraph in soup.find_all("p"):
+        length = len(_normalize_space(paragraph.get_text()))
+        if length < MIN_PARAGRAPH_CHARS:
+            continue
+        parent = paragraph.parent
+        scores[parent] = scores.get(parent, 0) + length
+        if parent.parent is not None:
+            scores[parent.parent] = scores.get(parent.parent, 0) + length / 2
+    if scores:
+        return max(scores, key=scores.get)
+    return soup.body or soup
+
+
+def _is_link_list_item(tag, text):
+    link_text = sum(len(_normalize_space(link.get_text())) for link in tag.find_all("a"))
+    return tag.name == "li" and link_text >= 0.8 * len(text)
+
+
+# Function to get all visible text of a page, for pages the article extraction finds nothing in
+def _page_text(html):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup.find_all(["script", "style", "noscript", "template", "svg"]):
+        tag.decompose()
+    return strip_boilerplate_lines((soup.body or soup).get_text("\n"))
+
+
+# Function to keep only the main article text of an HTML page.
+# When that leaves almost nothing (no real paragraph), the page's full visible text is used instead.
+def extract_main_text(html):
+    # bs4 is imported here so plain-text cleanup doesn't load the HTML parsing stack
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup.find_all(BOILERPLATE_TAGS):
+        # An article's own <header> carries its title and spot
+        if tag.name == "header" and tag.find_parent("article") is not None:
+            continue
+        tag.decompose()
+    page_chars = _paragraph_chars(soup)
+    for tag in soup.find_all(lambda tag: _is_boilerplate(tag, page_chars)):
+        tag.decompose()
+
+    container = _find_main_container(soup)
+    blocks = []
+    for tag in container.find_all(BLOCK_TAGS):
+        # Nested blocks (a <p> inside an <li>) are already part of their parent's text
+        if tag.find_parent(BLOCK_TAGS) is not None:
+            continue
+        text = _normalize_space(tag.get_text(" "))
+        if not text or _is_link_list_item(tag, text):
+            continue
+        blocks.append(text)
+
+    headline = soup.find("h1")
+    if headline is not None and container.find("h1") is None and _normalize_space(headline.get_text(" ")):
+        blocks.insert(0, _normalize_space(headline.get_text(" ")))
+
+    text = "\n\n".join(blocks) if blocks else strip_boilerplate_lines(container.get_text("\n"))
+    if len(text) < MIN_ARTICLE_CHARS and not any(len(block) >= MIN_PARAGRAPH_CHARS for block in blocks):
+        text = max(text, _page_text(html), key=len)
+    return text
+
+
+def _is_boilerplate_line(line):
+    if len(line.split()) > BOILERPLATE_LINE_MAX_WORDS:
+        return False
+    return bool(BOILERPLATE_LINE_PATTERN.search(line) or SHARE_LINE_PATTERN.match(line))
+
+
+def _is_short_line(line):
+    return len(line.split()) < SHORT_LINE_WORDS and not line.endswith((".", "!", "?", ":"))
+
+
+# Function to drop boilerplate from already extracted plain text: cookie/share/copyright lines,
+# repeated lines and the menus and footers left as runs of short lines at the start or end.
+# Paragraph breaks (blank lines) are kept.
+def strip_boilerplate_lines(text):
+    paragraphs = []
+    seen = set()
+    for block in re.split(r"\n\s*\n", text):
+        lines = []
+        for line in block.splitlines():
+            line = _normalize_space(line)
+            if not line or line in seen or _is_boilerplate_line(line):
+                continue
+            seen.add(line)
+            lines.append(line)
+        if lines:
+            paragraphs.append(lines)
+
+    # A lone short line is usually a heading; three or more in a row at the edges are a menu
+    lines = [line for paragraph in paragraphs for line in paragraph]
+    start = 0
+    while start < len(lines) and _is_short_line(lines[start]):
+        start += 1
+    end = len(lines)
+    while end > start and _is_short_line(lines[end - 1]):
+        end -= 1
+    if start < 3:
+        start = 0
+    if len(lines) - end < 3:
+        end = len(lines)
+    if start >= end:
+        start, end = 0, len(lines)
+
+    kept = []
+    position = 0
+    for paragraph in paragraphs:
+        kept_lines = [line for offset, line in enumerate(paragraph, start=position) if start <= offset < end]
+        position += len(paragraph)
+        if kept_lines:
+            kept.append("\n".join(kept_lines))
+    return "\n\n".join(kept)
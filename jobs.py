@@ -0,0 +1,154 @@
+import json
+import os
+import sqlite3
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+# Seconds between writes of streamed partial output to the job table
+PROGRESS_INTERVAL = 0.5
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+# What a running job sees: it reports its stage and streamed output through the handle,
+# which writes them to the job table at most every PROGRESS_INTERVAL seconds.
+class JobHandle:
+    def __init__(self, queue, job_id):
+        self.queue = queue
+        self.job_id = job_id
+        self.parts = []
+        self.meta = {}
+        self.last_flush = 0.0
+
+    def text(self):
+        return "".join(self.parts)
+
+    def append(self, chunk):
+        self.parts.append(chunk)
+        if time.monotonic() - self.last_flush >= PROGRESS_INTERVAL:
+            self.flush()
+
+    def set_stage(self, stage):
+        self.queue._update(self.job_id, stage=stage)
+
+    def set_meta(self, **fields):
+        self.meta.update(fields)
+        self.flush()
+
+    def flush(self):
+        self.last_flush = time.monotonic()
+        self.queue._update(self.job_id, partial=self.text(), meta=json.dumps(self.meta, ensure_ascii=False))
+
+
+# Worker pool with a SQLite job table. Submitting returns a job id at once; the work runs
+# on a pool thread and its progress and result are stored, so any page can poll for them.
+class JobQueue:
+    def __init__(self, path, workers=4):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, status TEXT NOT NULL, params TEXT NOT NULL, stage TEXT, "
+                "partial TEXT, result TEXT, error TEXT, meta TEXT, "
+                "created_at REAL NOT NULL, started_at REAL, finished_at REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_created ON jobs (created_at)")
+            # The work of jobs from an earlier process is gone with it (one server per jobs file)
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE status IN (?, ?)",
+                (FAILED, "Interrupted by a server restart.", time.time(), QUEUED, RUNNING),
+            )
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _update(self, job_id, **fields):
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._connect() as conn:
+            conn.execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+
+    # Queues work(handle) and returns the new job id; params are stored for display only
+    def submit(self, params, work):
+        job_id = uuid.uuid4().hex[:12]
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, params, created_at) VALUES (?, ?, ?, ?)",
+                (job_id, QUEUED, json.dumps(params, ensure_ascii=False), time.time()),
+            )
+        self.executor.submit(self._run, job_id, work)
+        return job_id
+
+    def _run(self, job_id, work):
+        self._update(job_id, status=RUNNING, started_at=time.time())
+        handle = JobHandle(self, job_id)
+        try:
+            result = work(handle)
+        except Exception as error:
+            self._update(
+                job_id,
+                status=FAILED,
+                error=f"{type(error).__name__}: {error}",
+                partial=handle.text(),
+                meta=json.dumps(handle.meta, ensure_ascii=False),
+                finished_at=time.time(),
+            )
+            return
+        self._update(
+            job_id,
+            status=DONE,
+            result=result,
+            partial=None,
+            meta=json.dumps(handle.meta, ensure_ascii=False),
+            finished_at=time.time(),
+        )
+
+    def _to_dict(self, row):
+        job = dict(row)
+        job["params"] = json.loads(job["params"])
+        job["meta"] = json.loads(job["meta"]) if job["meta"] else {}
+        return job
+
+    def get(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    # Returns the given jobs (or the most recent ones), newest first
+    def list(self, job_ids=None, limit=20):
+        with self._connect() as conn:
+            if job_ids is None:
+                rows = conn.execute("SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)).fetchall()
+            else:
+                placeholders = ", ".join("?" for _ in job_ids)
+                rows = conn.execute(
+                    f"SELECT * FROM jobs WHERE id IN ({placeholders}) ORDER BY created_at DESC LIMIT ?",
+                    (*job_ids, limit),
+                ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    # Number of queued jobs submitted before this one
+    def position(self, job_id):
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = ? AND created_at < "
+                "(SELECT created_at FROM jobs WHERE id = ?)",
+                (QUEUED, job_id),
+            ).fetchone()[0]
@@ -0,0 +1,221 @@
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logging.handlers import RotatingFileHandler
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from budget import estimate_tokens
+from config import METRICS_BACKUPS, METRICS_MAX_MB, METRICS_PATH
+
+# Histogram buckets (seconds) for stage durations
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+_logger_lock = threading.Lock()
+
+
+# Process-wide aggregates of every finished run, rendered in Prometheus text format
+class MetricsRegistry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.durations = {}  # stage -> {"buckets": [...], "sum": float, "count": int}
+        self.tokens = {}  # (stage, direction) -> total tokens
+        self.runs = 0
+
+    def observe(self, stage, seconds, input_tokens=None, output_tokens=None):
+        with self.lock:
+            histogram = self.durations.setdefault(
+                stage, {"buckets": [0] * len(DURATION_BUCKETS), "sum": 0.0, "count": 0}
+            )
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if seconds <= bound:
+                    histogram["buckets"][index] += 1
+            histogram["sum"] += seconds
+            histogram["count"] += 1
+            for direction, tokens in (("input", input_tokens), ("output", output_tokens)):
+                if tokens:
+                    self.tokens[(stage, direction)] = self.tokens.get((stage, direction), 0) + tokens
+
+    def count_run(self):
+        with self.lock:
+            self.runs += 1
+
+    def render(self):
+        with self.lock:
+            lines = [
+                "# HELP content_generator_runs_total Finished generation runs.",
+                "# TYPE content_generator_runs_total counter",
+                f"content_generator_runs_total {self.runs}",
+                "# HELP content_generator_stage_seconds Duration of each pipeline stage.",
+                "# TYPE content_generator_stage_seconds histogram",
+            ]
+            for stage, histogram in sorted(self.durations.items()):
+                for bound, count in zip(DURATION_BUCKETS, histogram["buckets"]):
+                    lines.append(f'content_generator_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {count}')
+                lines.append(f'content_generator_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {histogram["count"]}')
+                lines.append(f'content_generator_stage_seconds_sum{{stage="{stage}"}} {histogram["sum"]:.6f}')
+                lines.append(f'content_generator_stage_seconds_count{{stage="{stage}"}} {histogram["count"]}')
+            lines.append("# HELP content_generator_tokens_total Tokens sent to and received from the model.")
+            lines.append("# TYPE content_generator_tokens_total counter")
+            for (stage, direction), tokens in sorted(self.tokens.items()):
+                lines.append(f'content_generator_tokens_total{{stage="{stage}",direction="{direction}"}} {tokens}')
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+# Function to get the logger that writes one JSON line per run to a rotating file
+def get_metrics_logger(path=METRICS_PATH):
+    logger = logging.getLogger("content_generator.metrics")
+    with _logger_lock:
+        if not logger.handlers:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            handler = RotatingFileHandler(
+                path, maxBytes=METRICS_MAX_MB * 1024 * 1024, backupCount=METRICS_BACKUPS, encoding="utf-8"
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+    return logger
+
+
+# Timings of one generation run, stage by stage
+class RunTrace:
+    def __init__(self, **fields):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.fields = fields
+        self.stages = []
+        self.lock = threading.Lock()
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+
+    def add(self, record):
+        with self.lock:
+            self.stages.append(record)
+
+    # Times the block as one stage; the yielded record can be given extra fields
+    @contextmanager
+    def stage(self, name, **fields):
+        record = {"stage": name, **fields}
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["duration_s"] = round(time.perf_counter() - start, 4)
+            self.add(record)
+
+    # LangChain callbacks that add prompt rendering and LLM stages to this trace
+    def callback(self):
+        return TraceCallbackHandler(self)
+
+    # Writes the run to the metrics file and the registry, and returns it
+    def finish(self, **fields):
+        record = {
+            "run_id": self.run_id,
+            "ts": self.started_at,
+            **self.fields,
+            **fields,
+            "total_s": round(time.perf_counter() - self.start, 4),
+            "stages": list(self.stages),
+        }
+        for stage in record["stages"]:
+            REGISTRY.observe(stage["stage"], stage["duration_s"], stage.get("input_tokens"), stage.get("output_tokens"))
+        REGISTRY.observe("total", record["total_s"])
+        REGISTRY.count_run()
+        get_metrics_logger().info(json.dumps(record, ensure_ascii=False, default=str))
+        return record
+
+
+class TraceCallbackHandler(BaseCallbackHandler):
+    def __init__(self, trace):
+        self.trace = trace
+        self.runs = {}
+
+    def on_chain_start(self, serialized, inputs, *, run_id, **kwargs):
+        if kwargs.get("run_type") == "prompt":
+            self.runs[run_id] = {"start": time.perf_counter()}
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        run = self.runs.pop(run_id, None)
+        if run:
+            self.trace.add({"stage": "prompt_render", "duration_s": round(time.perf_counter() - run["start"], 4)})
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        params = kwargs.get("invocation_params") or {}
+        self.runs[run_id] = {
+            "start": time.perf_counter(),
+            "first_token": None,
+            "model": params.get("model") or params.get("model_name"),
+            "input_estimate": sum(estimate_tokens(str(message.content)) for message in messages[0]),
+            "output_text": [],
+        }
+
+    def on_llm_new_token(self, token, *, run_id, **kwargs):
+        run = self.runs.get(run_id)
+        if run is None:
+            return
+        if run["first_token"] is None and token:
+            run["first_token"] = time.perf_counter()
+        run["output_text"].append(str(token))
+
+    def _finish_llm(self, run_id, **fields):
+        run = self.runs.pop(run_id, None)
+        if run is None:
+            return
+        end = time.perf_counter()
+        record = {"stage": "llm", "model": run["model"], "duration_s": round(end - run["start"], 4)}
+        if run["first_token"] is not None:
+            record["ttft_s"] = round(run["first_token"] - run["start"], 4)
+        record.update(fields)
+        record.setdefault("input_tokens", run["input_estimate"])
+        record.setdefault("output_tokens", estimate_tokens("".join(run["output_text"])))
+        generation_time = end - (run["first_token"] or run["start"])
+        if generation_time > 0 and record["output_tokens"]:
+            record["tokens_per_s"] = round(record["output_tokens"] / generation_time, 1)
+        self.trace.add(record)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        fields = {}
+        generation = response.generations[0][0] if response.generations and response.generations[0] else None
+        usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+        if usage:
+            fields = {"input_tokens": usage["input_tokens"], "output_tokens": usage["output_tokens"]}
+        run = self.runs.get(run_id)
+        if run is not None and not run["output_text"] and generation is not None:
+            # Not streamed: count the whole answer at once
+            run["output_text"].append(generation.text)
+        self._finish_llm(run_id, **fields)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._finish_llm(run_id, error=f"{type(error).__name__}: {error}")
+
+
+# Function to serve the registry as a Prometheus-style /metrics endpoint in a background thread
+def start_metrics_server(port, registry=REGISTRY):
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,126 @@
+from operator import itemgetter
+
+from langchain_core.output_parsers import StrOutputParser
+
+from cache import SQLiteCache
+from config import (
+    EMBEDDING_CACHE_MAX_MB,
+    FACT_SHEET_CACHE_MAX_MB,
+    LLM_CACHE_MAX_AGE,
+    LLM_CACHE_MAX_MB,
+    LLM_CACHE_PATH,
+    TAVILY_CACHE_MAX_MB,
+    TAVILY_CACHE_TTL,
+    URL_CACHE_MAX_MB,
+    URL_CACHE_PATH,
+    URL_CACHE_TTL,
+)
+
+# Models offered for each provider
+PROVIDER_MODELS = {
+    "Groq": ["llama3-70b-8192", "llama-3.1-70b-versatile"],
+    "OpenAI": ["gpt-4o", "gpt-4o-mini"],
+}
+
+
+# Function to build the chat model for the selected provider.
+# Provider packages are imported here so a session only loads the one it uses.
+def build_llm(provider, model, temperature, max_tokens, api_key):
+    if provider == "OpenAI":
+        from langchain_openai import ChatOpenAI
+        return ChatOpenAI(
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            openai_api_key=api_key
+        )
+    if provider == "Groq":
+        from langchain_groq import ChatGroq
+        return ChatGroq(
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            groq_api_key=api_key
+        )
+    raise ValueError(f"Unknown model provider: {provider!r}")
+
+
+# Function to build the Tavily retriever (imported on first use)
+def build_retriever(k, api_key):
+    from langchain_community.retrievers import TavilySearchAPIRetriever
+    return TavilySearchAPIRetriever(k=k, include_raw_content=True, api_key=api_key)
+
+
+# Function to build the content cache for fetched URLs
+def create_url_cache():
+    return SQLiteCache(
+        URL_CACHE_PATH,
+        table="url_articles",
+        ttl=URL_CACHE_TTL,
+        max_bytes=URL_CACHE_MAX_MB * 1024 * 1024,
+        keep_stale=True,
+    )
+
+
+# Function to build the cache for Tavily search results
+def create_tavily_cache():
+    return SQLiteCache(
+        URL_CACHE_PATH,
+        table="tavily_results",
+        ttl=TAVILY_CACHE_TTL,
+        max_bytes=TAVILY_CACHE_MAX_MB * 1024 * 1024,
+    )
+
+
+# Function to build the opt-in cache for generated responses
+def create_response_cache():
+    return SQLiteCache(
+        LLM_CACHE_PATH,
+        table="responses",
+        ttl=LLM_CACHE_MAX_AGE,
+        max_bytes=LLM_CACHE_MAX_MB * 1024 * 1024,
+    )
+
+
+# Function to build the cache for per-source fact sheets (keyed by model, prompt and source text)
+def create_fact_sheet_cache():
+    return SQLiteCache(
+        LLM_CACHE_PATH,
+        table="fact_sheets",
+        ttl=LLM_CACHE_MAX_AGE,
+        max_bytes=FACT_SHEET_CACHE_MAX_MB * 1024 * 1024,
+    )
+
+
+# Function to build the cache for chunk embeddings (keyed by content hash, never expires)
+def create_embedding_cache():
+    return SQLiteCache(
+        URL_CACHE_PATH,
+        table="embeddings",
+        max_bytes=EMBEDDING_CACHE_MAX_MB * 1024 * 1024,
+    )
+
+
+# Define the chain for SEO generation
+def create_seo_chain(prompt, llm):
+    return (
+        {"context": itemgetter("context"), "konu": itemgetter("konu")}
+        | prompt
+        | llm
+        | StrOutputParser()
+    )
+
+
+# Define the chain for non-SEO generation
+def create_non_seo_chain(prompt, llm):
+    return (
+        {"context": itemgetter("context")}
+        | prompt
+        | llm
+        | StrOutputParser()
+    )
+
+
+# Define the chain for repair prompts, which take their variables as given
+def create_repair_chain(prompt, llm):
+    return prompt | llm | StrOutputParser()
@@ -0,0 +1,318 @@
+# Prompt templates for every generation mode
+seo_content_prompt = """
+Sana verilen contexti kullanarak istenen konu hakkında SEO içerik üretmen bekleniyor.
+Türkçe düzgün kullanılmalı, ve profosyonel bir dili olmalı.
+
+Başlık Belirleme:
+
+* Soruya yanıt olarak, anahtar kelimeyi içeren ve dikkat çekici bir başlık oluştur. Başlığı 50-60 karakteri geçmeyecek şekilde düzenle.
+
+Spot Cümle (Özet) Oluşturma:
+
+* Soruya kısa ve öz bir yanıt vererek bu yanıtı meta açıklama formatında (150-160 karakter) yaz. Spot cümleyi, anahtar kelimeyi içerecek ve okuyucuyu içeriği okumaya teşvik edecek şekilde oluştur. Kullanıcının sayfada ne bulacağını net bir şekilde anlat. Şuna benzer "Daha fazla bilgi için tıklayın" ifadeler ekle.
+
+İçerik Oluşturma:
+
+* İçeriğin giriş, gelişme ve sonuç bölümlerini mantıklı bir sıralamayla yapılandır. Anahtar kelimenin doğal bir şekilde içerikte kullanılmasını sağla. İçeriği mantıklı bölümlere ayır ve alt başlıklar (H2, H3) ekle. Alt başlıklar anahtar kelimeleri barındırsın.
+
+İçerik Uzunluğu ve Derinliği Talimatları:
+
+İçerik Uzunluğu:
+
+* İçeriğin uzunluğu, en az 1000 kelime olmalıdır. Bu, SEO açısından minimum gereksinimi karşılar.
+
+İçerik Derinliği:
+
+* Kısa paragraflar, liste kullanımı, maddeler ve önemli bilgilerin vurgulanması gibi unsurlar eklenerek içeriğin kullanıcı dostu olmasını sağla.
+* "Ebilecek", "abilecek", "ebilir", "abilir", "mektedir", "maktadır" gibi fiillerden kaçın.  
+* Haberin akışını sağlamak için "ancak", "dolayısıyla", "buna ek olarak" gibi geçiş kelimelerini kullan. 
+* Haberi daha etkili sunabilmek için "dedi", "ifadelerini kullandı", "söyledi", "vurguladı", "aktardı", "diye yazdı", "dile getirdi", "açıkladı", "belirtti", "öne çıkardı", "altını çizdi", "şu sözlere yer verdi", "değindi", "işaret etti", "şunu kaydetti", "gündeme taşıdı" gibi ifadeleri konuşma, beyan ve demeç bölümlerinde sıkça kullan.
+* İçerikte yalnızca yüzeysel bilgilerle yetinme; konuyu detaylı ve kapsamlı bir şekilde ele al.
+* İçerik derinliğini artırmak için uzman görüşlerine veya güvenilir kaynaklara dayalı alıntılar ekle.
+* Anahtar kelimenin doğal bir şekilde yer aldığı ve konuyu derinlemesine açıklayan paragraflar oluştur.
+* İçeriğin kullanıcı sorularına tatmin edici ve çözüm odaklı yanıtlar verdiğinden emin ol.
+* Destekleyici örnekler, istatistikler veya araştırma sonuçları ekleyerek içeriğin güvenilirliğini artır.
+* Okuyucuyu içeriğe bağlayacak etkili argümanlar ve görüşler sun; ancak tüm bunlar tarafsız olsun.
+* İçeriğin sonuna doğru, konuyu toparlayarak okuyucuyu net bir sonuç ile baş başa bırak. Kullanıcıyı yönlendirecek açık bir çağrı yap.
+
+Context: {context}
+
+Konu: {konu}
+"""
+
+bir_metinden_haber_prompt = """
+Context içerisinde yer alan haber metinlerinden yola çıkarak yeni ve özgün bir haber oluşturman gerekiyor. Bu haber, tamamen orijinal olmalı ve intihal izlenimi vermemeli. Türkçe dil bilgisine uygun, akıcı ve profesyonel bir üslup kullanılmalı.
+
+BAŞLIK
+ 
+* Başlıkta belirsizlik yarat, net olmayan ifadeler kullan. Başlık en fazla 12 kelime olsun, içeriği doğru yansıtsın. Soru cümlesi kullanma. Pasif yapı kullanma. Her bir başlık haberin farklı yönlerini vurgulayan çeşitli açılardan yaklaşmalı. 5 farklı başlık önerisi sun. Nokta ile ayır. 
+
+SPOT
+
+* Spot, başlıkla uyumlu ve haberin ana detaylarını özetler nitelikte olmalı. 1-2 cümle içinde kim, ne, nerede, ne zaman, nasıl, neden gibi soruların cevaplarını ver. Okuyucunun ilgisini çekecek ancak haberin tamamını açık etmeyecek bir dil kullan. Doğal şekilde anahtar kelimeler içermeli ve SEO uyumlu olmalı.
+
+HABER METNİ
+
+PARAGRAFLAR İÇİN TALİMATLAR
+
+* Metni tamamen özgün hale getir ve intihalden arındır. 
+* Paragrafları kısa tut, cümleler 12 kelimeyi geçmesin.
+* Kritik noktaları ve özel isimleri bold yap.
+* "Ebilecek", "abilecek", "ebilir", "abilir", "mektedir", "maktadır" gibi fiillerden kaçın.  
+* Aktif cümle yapıları kullan, pasif yapılardan kaçın. Bu sayede daha dinamik ve doğrudan cümleler oluştur. 
+* Haberin akışını sağlamak için "ancak", "dolayısıyla", "buna ek olarak" gibi geçiş kelimelerini kullan. 
+* Haberi daha etkili sunabilmek için "dedi", "ifadelerini kullandı", "söyledi", "vurguladı", "aktardı", "diye yazdı", "dile getirdi", "açıkladı", "belirtti", "öne çıkardı", "altını çizdi", "şu sözlere yer verdi", "değindi", "işaret etti", "şunu kaydetti", "gündeme taşıdı" gibi ifadeleri konuşma, beyan ve demeç bölümlerinde sıkça kullan.
+* Ara başlıkları büyük harflerle yaz. 
+* Gereksiz tekrarlar yapma. Aynı ifadeleri tekrarlama.
+*  SEO kurallarına uy. Anahtar kelime yoğunluğuna dikkat et. Meta açıklamaları, başlıklar ve alt başlıkları doğru kullan.
+* Metne dışarıdan yorum ya da sonuç ekleme.
+
+Giriş (İlk Paragraf)
+
+* Haberin en önemli detaylarını hızlı ve öz bir şekilde özetle. Kim, ne, nerede, ne zaman sorularına net cevap ver. 
+* İlk paragraf 30 kelimeyi geçmesin.
+
+Gelişme (Orta Paragraflar) 
+
+* Haberi detaylandırırken her paragraf kısa (3-4 cümle) ve net olmalı.
+
+Context: {context}
+"""
+
+birden_fazla_metinden_haber_prompt = """
+Context içerisinde yer alan haber metinlerinden yola çıkarak yeni ve özgün bir haber oluşturman gerekiyor. Bu haber, tamamen orijinal olmalı ve intihal izlenimi vermemeli. Türkçe dil bilgisine uygun, akıcı ve profesyonel bir üslup kullanılmalı.
+
+BAŞLIK
+ 
+* Başlıkta belirsizlik yarat, net olmayan ifadeler kullan. Başlık en fazla 12 kelime olsun, içeriği doğru yansıtsın. Soru cümlesi kullanma. Pasif yapı kullanma. Her bir başlık haberin farklı yönlerini vurgulayan çeşitli açılardan yaklaşmalı. 5 farklı başlık önerisi sun. Nokta ile ayır. 
+
+SPOT
+
+* Spot, başlıkla uyumlu ve haberin ana detaylarını özetler nitelikte olmalı. 1-2 cümle içinde kim, ne, nerede, ne zaman, nasıl, neden gibi soruların cevaplarını ver. Okuyucunun ilgisini çekecek ancak haberin tamamını açık etmeyecek bir dil kullan. Doğal şekilde anahtar kelimeler içermeli ve SEO uyumlu olmalı.
+HABER METNİ
+
+
+* Metinleri tamamen özgün hale getir ve intihalden arındır.  
+
+Birbirlerine harmanla ve metinlere şu talimatları uygula:
+
+* Aynı konudaki birden fazla metni kullanarak zenginleştirilmiş, kapsamlı bir haber oluştur.
+Metinlerin ortak noktalarını tespit et ve bu unsurları haberin ana eksenine yerleştir. Farklı metinlerde geçen ek bilgileri ve çeşitli bakış açılarını kullanarak haberin detaylarını genişlet.
+
+Tematik Farklılıkları Kullan
+
+* Metinlerde yer alan farklı tema ve bilgileri vurgulayarak haberi daha derinlemesine incele. Bu sayede haber sadece bir kaynağa bağlı kalmadan, daha zengin ve kapsamlı bir içerik sunar. Ancak temalar arasındaki tutarlılığı korumaya dikkat et.
+
+Bilgilerin Uyumluluğuna Dikkat Et
+
+* Farklı kaynaklardaki bilgilerin uyumlu olmasına özen göster. Tutarsızlıkları fark ettiğinde ya doğrulanmış bilgiyi kullan ya da haberde denge kurarak tüm farklı görüşleri doğru şekilde yansıt. Gerektiğinde farklı perspektifleri bağlayıcı geçişlerle sun
+
+PARAGRAFLAR İÇİN TALİMATLAR
+
+* Metni tamamen özgün hale getir ve intihalden arındır. 
+* Paragrafları kısa tut, cümleler 12 kelimeyi geçmesin.
+* Kritik noktaları ve özel isimleri bold yap.
+* "Ebilecek", "abilecek", "ebilir", "abilir", "mektedir", "maktadır" gibi fiillerden kaçın.  
+ * Aktif cümle yapıları kullan, pasif yapılardan kaçın. Bu sayede daha dinamik ve doğrudan cümleler oluştur. 
+* Haberin akışını sağlamak için "ancak", "dolayısıyla", "buna ek olarak" gibi geçiş kelimelerini kullan. 
+* Haberi daha etkili sunabilmek için "dedi", "ifadelerini kullandı", "söyledi", "vurguladı", "aktardı", "diye yazdı", "dile getirdi", "açıkladı", "belirtti", "öne çıkardı", "altını çizdi", "şu sözlere yer verdi", "değindi", "işaret etti", "şunu kaydetti", "gündeme taşıdı" gibi ifadeleri konuşma, beyan ve demeç bölümlerinde sıkça kullan.
+* Ara başlıkları büyük harflerle yaz. 
+* Gereksiz tekrarlar yapma. Aynı ifadeleri tekrarlama.
+*  SEO kurallarına uy. Anahtar kelime yoğunluğuna dikkat et. Meta açıklamaları, başlıklar ve alt başlıkları doğru kullan.
+* Metne dışarıdan yorum ya da sonuç ekleme.
+
+Giriş (İlk Paragraf)
+
+* Haberin en önemli detaylarını hızlı ve öz bir şekilde özetle. Kim, ne, nerede, ne zaman sorularına net cevap ver. İlk paragraf 30 kelimeyi geçmesin.
+
+Gelişme (Orta Paragraflar) 
+
+* Haberi detaylandırırken her paragraf kısa (3-4 cümle) ve net olmalı.
+Context: {context}
+"""
+
+kose_yazisindan_haber_prompt = """
+Context içerisinde yer alan haber metinlerinden yola çıkarak yeni ve özgün bir haber oluşturman gerekiyor. Bu haber, tamamen orijinal olmalı ve intihal izlenimi vermemeli. Türkçe dil bilgisine uygun, akıcı ve profesyonel bir üslup kullanılmalı.
+
+BAŞLIK
+
+Haber metninin özünü yansıtacak, kısa ve çarpıcı bir başlık oluştur. Başlık 8-12 kelimeyi geçmesin. Haber hakkında merak uyandıracak ve okuyucuyu içeriğe yönlendirecek anahtar kelimeler içer. Öne çıkan olayları ve konuları basit, net bir dille ifade et.  Cümleler kısa ve öz olsun, karmaşık yapılardan kaçın. Başlıklarda belirsiz özne kullanarak gizem yarat, doğrudan ve çekici bir mesaj ver.
+
+Haber metninden yola çıkarak EN AZ 5 FARKLI başlık önerisi sun. Her bir başlık haberin farklı yönlerini vurgulayan çeşitli açılardan yaklaşmalı.
+
+SPOT
+
+Spot, başlıkla uyumlu ve haberin ana detaylarını özetler nitelikte olmalı. 1-2 cümle içinde kim, ne, nerede, ne zaman, nasıl, neden gibi soruların cevaplarını ver. Okuyucunun ilgisini çekecek ancak haberin tamamını açık etmeyecek bir dil kullan. Doğal şekilde anahtar kelimeler içermeli ve SEO uyumlu olmalı.
+
+HABER METNİ
+
+XXXXXXX yazarı XXXXXXX XXXXXX "YYYYYYY  YYYYYYYY’ başlıklı köşesinde çok önemli noktalara dikkat çekti. 
+
+Bu köşe yazısını daha etkili sunabilmek için "dedi", "ifadelerini kullandı", "söyledi", "vurguladı", "aktardı", "diye yazdı", "dile getirdi", "açıkladı", "belirtti", "öne çıkardı", "altını çizdi", "şu sözlere yer verdi", "değindi", "işaret etti", "şunu kaydetti", "gündeme taşıdı" ve benzeri ifadeleri çeşitli şekillerde kullanarak habere metnine dönüştür. 
+
+Kritik noktaları ve özel isimleri bold yap.
+
+Aktif cümle yapıları kullan. Pasif yapılardan kaçın. Bu sayede daha dinamik ve doğrudan cümleler oluştur. 
+
+SEO kurallarına uy. Anahtar kelime yoğunluğuna dikkat et. Meta açıklamaları, başlıklar ve alt başlıkları doğru kullan.
+
+Metne dışarıdan yorum ya da sonuç ekleme.
+
+Context: {context}
+"""
+
+
+
+
+# New prompt for "HABERİ YENİDEN YAZMA"
+haberi_yeniden_yazma_prompt = """
+Bu metni intihalden tamamen kurtararak habere dönüştür. Başlık, spot ve haber metni şeklinde. 
+Ara başlıkları büyük harflerle yaz. Kritik noktaları ve özel isimleri bold yap. Cümleler 12 kelimeyi geçmesin.
+Aktif cümle yapıları kullan, pasif yapılardan kaçın.
+
+BAŞLIK YAZMA
+
+1-Volkan Demirel son noktayı koydu!
+2-Adana Demirspor yine eli boş döndü!
+3-Volkan kritik teklifi kabul etmedi!
+4-Aziz Yıldırım Okan Buruk'la ne konuştu. Ortaya çıktı
+5-Fenerbahçe'de Mourinho'yu şok eden ayrılık. Bırakıp gitti
+6-Mourinho'dan flaş Ali Koç ve derbi açıklaması. Saygısızlık yapıldı
+7-Dursun Özbek Mourinho'ya 'Yatarak' karşılık verdi
+8-Hacıosmanoğlu Ali Koç'a küçük dilini yutturdu
+9-Acun Ilıcalı Bayramiç'te sessiz sedasız çalışmalara başladı
+10-Böyle şike görülmedi. 4-1 yenilmesi gerekiyordu 4-1 yenildi
+11-Ebrar Karakurt Rusya'yı ayağa kaldırdı. Yok artık
+12-Merkezefendi maça çıkarmadan gönderdi
+13-Arda Güler 15 dakikada Ancelotti'yi kurtardı
+14-Mustafa Denizli imzayı attı
+15-Sergen Yalçın yeni adresini açıkladı
+16-Mustafa Sarıgül hastaneye koştu. Serhat Akın'ın odasından ilk videoyu paylaştı
+17-Van Bronckhorst maçı sattı mı? Sırrı maçtan önce söylediklerinde saklı
+18-Temmuz'da kıyamet kopacak!
+19-Yüzde 50 zam geldi. Yarından itibaren geçerli!
+20-Emekli zil takıp oynayacak! Bayram ikramiyesi netleşti, Nisan’da hesaplara yatacak
+21-Kuyumcular Artık Satın Almıyor. 81 İlde Altın İçin Yeni Uygulama Başlıyor
+22-Dolarda gece yarısı vurgununu kim yaptı?
+23-Parasını Altında Tutanlara Kötü Haber
+24-Altın İthalatında Yıllar Sonra Bir İlk
+25-Yarın Sabah Başlıyor. Altın Fiyatlarında Haftalar Sonra Bir İlk Yaşanacak
+26-İflas eden ünlü iş insanı hurdacılık yaparken görüntülendi
+27-Altın Sahiplerine Soğuk Duş. Hazırlığa Başlayın
+28-Merkez Bankası'ndan Yeni Döviz Kararı. Dolar Kurunu Altüst Edecek
+29-Koç Ailesine Büyük Darbe. Bir Haftada 150 Milyon Dolar Kaybettiler
+30-Yarından sonra fiyatlar değişti. Bir zam daha geldi
+31-Eşinin aldattığından şüpheleniyordu. Gizli kamera ile eşini kaydeden adam utancından yerin dibine girdi
+32-Perdelerini kapatmayı unutan çiftin rezil olduğu anlar kamerada! Sosyal medyada izlenme rekorları kırdı
+33-Kocasıyla ilişkiye girdiği sırada yanlışlıkla canlı yayın açtı, babası dahil 45 kişi izledi
+34-Meğer onlardan kurtulmak çok kolaymış: Sivrisineklerden jet hızından kurtulmanın tüyosu belli oldu
+35-19 ülkeden 34 kişiyle flört eden gezgin kadın Türkiye'de yaşadıklarını anlattı
+36-Çocuğunuz Bu Ayda Doğmuşsa Dahi Olabilir!
+37-Bu meşrubatı sakın içmeyin, bağışıklık sistemini paramparça yapıyor! Canan Karatay ısrarla uyardı
+38-Sakın Çöpe Atmayın! Değerini Öğrenince Çok Şaşıracaksınız
+39-Ünlü türkücü, Türkiye'yi terk etti! İsviçre'de köy hayatı yaşıyor
+40-Bilenler Nüfus Müdürlüğü'ne Akın Ediyor. Üstelik Bedava Ve Sadece 5 Dakikada İşlem Hallediliyor
+41-T.C Kimlik Numarasını Ezbere Bilenlerin Tamamını İlgilendiriyor
+42-Bildiğiniz duaları unutun. Teravih namazında dağıtılan suların üstündeki not görenleri hayrete düşürdü
+43-Aziz Yıldırım Galatasaray'ı kurtaracak
+44-Fenerbahçe 49 topu kaptı
+45-Muslera'nın zamanı doluyor
+46-Ali Koç ünlü doktoru duyunca ağzı açık kaldı 
+
+Yukarıdaki 46 örnekteki başlıklar, haberlerde birbirinden bağımsız iki konuyu 3-4 kelimeyle, nokta ile ayırıyor. İlk bölümü öznelerin tepkilerine, hareketlerine veya duygularına odaklıyor Bu şekilde okuyucunun dikkatini çekiyor. Yeni yazdığın haberden bu başlık örneklerine benzer 5 adet dikkat çekici ve belirsiz haber başlığı önerisi sun. Nokta ile ayır.
+
+Context: {context}
+
+"""
+
+# Map step of multi-source news: condenses one source into a fact sheet for the final prompt
+fact_sheet_prompt = """
+Aşağıdaki haber metnini, başka kaynaklarla birleştirilecek kısa bir bilgi kartına dönüştür.
+Yalnızca metinde geçen bilgileri kullan; yorum ekleme, tahmin yürütme.
+Aşağıdaki başlıkları kullan, metinde karşılığı olmayan başlıkların yanına "-" yaz.
+
+Kim: (olaydaki kişiler ve kurumlar, unvanlarıyla)
+Ne: (olayın kendisi, 1-3 kısa cümle)
+Nerede:
+Ne zaman:
+Rakamlar: (sayılar, tutarlar, oranlar)
+Alıntılar: (doğrudan alıntılar, tırnak içinde ve kime ait olduğuyla)
+Diğer önemli ayrıntılar: (madde madde)
+
+Metin: {context}
+"""
+
+# Targeted repairs of generated text that breaks a prompt's rules (see validate.py)
+sentence_repair_prompt = """
+Aşağıdaki numaralı cümleler bir haber metninden alındı ve yazım kurallarına uymuyor.
+Her cümleyi anlamını, özel isimlerini ve bold (**) işaretlerini koruyarak yeniden yaz:
+
+{rules}
+
+Yalnızca düzeltilmiş cümleleri aynı numaralarla, her numara tek satırda olacak şekilde yaz.
+Bir cümleyi ikiye bölersen ikisini de aynı satıra yaz. Açıklama ekleme.
+
+{sentences}
+"""
+
+length_repair_prompt = """
+Aşağıdaki {field} {min_chars}-{max_chars} karakter uzunluğunda olacak şekilde yeniden yaz. Şu an {length} karakter.
+Anlamını ve anahtar kelimeyi ({konu}) koru. Yalnızca yeni metni yaz; tırnak, etiket veya açıklama ekleme.
+
+Metin: {text}
+"""
+
+expand_prompt = """
+Ana hatları aşağıda verilen SEO makalesi "{konu}" konusunda ve şu an {words} kelime. Makale en az {min_words} kelime olmalı.
+Makaleye eklenecek, mevcut bölümleri tekrar etmeyen yeni bir bölüm yaz:
+
+* Bölüm "## " ile başlayan ve anahtar kelimeyi içeren bir alt başlıkla başlasın.
+* Alt başlığın altında en az {missing} kelime olsun. Kısa paragraflar kullan.
+* Yalnızca context içindeki bilgileri kullan.
+* "Ebilecek", "abilecek", "ebilir", "abilir", "mektedir", "maktadır" gibi fiillerden kaçın.
+
+Yalnızca yeni bölümü yaz.
+
+Mevcut bölümler:
+{outline}
+
+Context: {context}
+"""
+
+
+# Prompt modes as shown in the app, mapped to their templates
+SEO_MODE = "SEO Content Generator"
+MULTI_SOURCE_MODE = "BİRDEN FAZLA METİNDEN HABER YAZMA"
+PROMPTS = {
+    SEO_MODE: seo_content_prompt,
+    "BİR METİNDEN HABER YAZMA": bir_metinden_haber_prompt,
+    MULTI_SOURCE_MODE: birden_fazla_metinden_haber_prompt,
+    "KÖŞE YAZISINDAN HABER YAZMA": kose_yazisindan_haber_prompt,
+    "HABERİ YENİDEN YAZMA": haberi_yeniden_yazma_prompt,
+}
+
+# Short names accepted for the prompt modes outside the app (e.g. batch job files)
+MODE_ALIASES = {
+    "SEO": SEO_MODE,
+    "BİR METİNDEN": "BİR METİNDEN HABER YAZMA",
+    "BİRDEN FAZLA": "BİRDEN FAZLA METİNDEN HABER YAZMA",
+    "KÖŞE YAZISI": "KÖŞE YAZISINDAN HABER YAZMA",
+    "YENİDEN YAZMA": "HABERİ YENİDEN YAZMA",
+    "seo": SEO_MODE,
+    "bir-metinden": "BİR METİNDEN HABER YAZMA",
+    "birden-fazla": "BİRDEN FAZLA METİNDEN HABER YAZMA",
+    "kose-yazisi": "KÖŞE YAZISINDAN HABER YAZMA",
+    "yeniden-yazma": "HABERİ YENİDEN YAZMA",
+}
+
+
+# Function to turn a mode label or alias into the app's mode label
+def resolve_mode(name):
+    name = name.strip()
+    if name in PROMPTS:
+        return name
+    if name in MODE_ALIASES:
+        return MODE_ALIASES[name]
+    if name.lower() in MODE_ALIASES:
+        return MODE_ALIASES[name.lower()]
+    raise ValueError(f"Unknown prompt mode: {name!r}")
@@ -0,0 +1,82 @@
+import hashlib
+import uuid
+
+from langchain_chroma import Chroma
+from langchain_core.embeddings import Embeddings
+from langchain_huggingface import HuggingFaceEmbeddings
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from config import EMBEDDING_BATCH_SIZE, EMBEDDING_MODEL, RETRIEVAL_TOP_K
+
+# Chunking and retrieval settings
+CHUNK_SIZE = 1000  # characters
+CHUNK_OVERLAP = 100
+
+
+# Embeddings wrapper that looks vectors up by content hash before computing the missing ones
+# in a single batch, so unchanged chunks are never embedded twice.
+class CachedEmbeddings(Embeddings):
+    def __init__(self, embeddings, cache, namespace):
+        self.embeddings = embeddings
+        self.cache = cache
+        self.namespace = namespace
+
+    def _key(self, text):
+        return hashlib.sha256(f"{self.namespace}\n{text}".encode("utf-8")).hexdigest()
+
+    def embed_documents(self, texts):
+        keys = [self._key(text) for text in texts]
+        vectors = {key: entry["value"] for key, entry in self.cache.get_many(keys).items()}
+
+        missing = {key: text for key, text in zip(keys, texts) if key not in vectors}
+        if missing:
+            computed = dict(zip(missing, self.embeddings.embed_documents(list(missing.values()))))
+            self.cache.set_many(computed)
+            vectors.update(computed)
+        return [vectors[key] for key in keys]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+# Function to load the local CPU embedding model behind the embedding cache
+def create_embeddings(cache, model_name=EMBEDDING_MODEL):
+    model = HuggingFaceEmbeddings(
+        model_name=model_name,
+        model_kwargs={"device": "cpu"},
+        encode_kwargs={"batch_size": EMBEDDING_BATCH_SIZE, "normalize_embeddings": True},
+    )
+    return CachedEmbeddings(model, cache, model_name)
+
+
+# Function to split every source into chunks, remembering where each chunk came from
+def split_sources(texts, chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP):
+    splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    chunks = []
+    metadatas = []
+    for source, text in enumerate(texts):
+        for position, chunk in enumerate(splitter.split_text(text)):
+            chunks.append(chunk)
+            metadatas.append({"source": source, "position": position})
+    return chunks, metadatas
+
+
+# Function to keep only the k chunks most relevant to the query.
+# The selected chunks are returned in source order so the context still reads naturally.
+def retrieve_relevant_chunks(texts, query, embeddings, k=RETRIEVAL_TOP_K):
+    chunks, metadatas = split_sources(texts)
+    if len(chunks) <= k:
+        return texts
+
+    store = Chroma.from_texts(
+        chunks,
+        embedding=embeddings,
+        metadatas=metadatas,
+        collection_name=f"sources-{uuid.uuid4().hex}",
+    )
+    try:
+        docs = store.similarity_search(query, k=k)
+    finally:
+        store.delete_collection()
+    docs.sort(key=lambda doc: (doc.metadata["source"], doc.metadata["position"]))
+    return [doc.page_content for doc in docs]
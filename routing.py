@@ -0,0 +1,139 @@
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+
+from config import ROUTING_LOG_PATH
+
+_log_lock = threading.Lock()
+
+
+# Function to append one routing decision to the JSONL decision log
+def log_decision(event, path=ROUTING_LOG_PATH):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    line = json.dumps(event, ensure_ascii=False)
+    with _log_lock, open(path, "a", encoding="utf-8") as file:
+        file.write(line + "\n")
+
+
+# Function to tell rate-limit errors (HTTP 429) apart from other failures
+def is_rate_limited(error):
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    return status == 429 or "rate limit" in str(error).lower()
+
+
+# One running generation. Chunks, completion and errors are pushed onto a shared queue
+# tagged with the attempt, so the router can wait on all attempts at once.
+class _Attempt:
+    def __init__(self, label, chain, inputs, events, config=None):
+        self.label = label
+        self.cancelled = threading.Event()
+        self.events = events
+        threading.Thread(target=self._run, args=(chain, inputs, config), daemon=True).start()
+
+    def _run(self, chain, inputs, config):
+        try:
+            for chunk in chain.stream(inputs, config=config):
+                if self.cancelled.is_set():
+                    # Leaving the loop closes the provider's stream
+                    return
+                if chunk:
+                    self.events.put((self, "chunk", chunk))
+            self.events.put((self, "done", None))
+        except Exception as error:
+            self.events.put((self, "error", error))
+
+
+# Function to stream from the first of several (label, chain) candidates to answer.
+# The primary starts at once. When no first token arrives within hedge_after seconds,
+# the next candidate is fired as a hedge; an error (e.g. a 429) fails over immediately.
+# The first attempt to deliver a token wins and the others are cancelled.
+# The winner's label and the request id are written into `route`.
+def hedged_stream(candidates, inputs, hedge_after, route=None, config=None):
+    route = route if route is not None else {}
+    request_id = uuid.uuid4().hex[:12]
+    route["request_id"] = request_id
+    start = time.perf_counter()
+    events = queue.Queue()
+    pending = list(candidates)
+    active = []
+
+    def log(event, label, **fields):
+        log_decision({
+            "ts": time.time(),
+            "request_id": request_id,
+            "event": event,
+            "model": label,
+            "elapsed_s": round(time.perf_counter() - start, 3),
+            "hedge_after_s": hedge_after,
+            **fields,
+        })
+
+    def launch(reason):
+        label, chain = pending.pop(0)
+        active.append(_Attempt(label, chain, inputs, events, config))
+        log(reason, label)
+
+    launch("primary")
+    winner = None
+    try:
+        while winner is None:
+            timeout = max(start + hedge_after - time.perf_counter(), 0) if pending else None
+            try:
+                attempt, kind, payload = events.get(timeout=timeout)
+            except queue.Empty:
+                launch("hedge")
+                continue
+            if kind == "error":
+                active.remove(attempt)
+                log("error", attempt.label, error=f"{type(payload).__name__}: {payload}", rate_limited=is_rate_limited(payload))
+                if pending:
+                    launch("failover")
+                elif not active:
+                    raise payload
+                continue
+
+            winner = attempt
+            route["winner"] = winner.label
+            log("first_token", winner.label)
+            for other in active:
+                if other is not winner:
+                    other.cancelled.set()
+                    log("cancel", other.label)
+
+        while True:
+            if kind == "chunk":
+                yield payload
+            elif kind == "done":
+                log("complete", winner.label)
+                return
+            else:
+                log("error", winner.label, error=f"{type(payload).__name__}: {payload}", rate_limited=is_rate_limited(payload))
+                raise payload
+            attempt, kind, payload = events.get()
+            while attempt is not winner:
+                attempt, kind, payload = events.get()
+    finally:
+        # Also stops the attempts when the caller abandons the stream early
+        for attempt in active:
+            attempt.cancelled.set()
+
+
+# Chain-like wrapper so hedged routing can be used wherever a chain's stream/invoke is.
+# After a run, `route` holds the request id and the label of the winning candidate.
+class HedgedChain:
+    def __init__(self, candidates, hedge_after):
+        self.candidates = candidates
+        self.hedge_after = hedge_after
+        self.route = {}
+
+    def stream(self, inputs, config=None):
+        self.route = {}
+        return hedged_stream(self.candidates, inputs, self.hedge_after, self.route, config)
+
+    def invoke(self, inputs, config=None):
+        return "".join(self.stream(inputs, config))
@@ -0,0 +1,124 @@
+import json
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from langchain_core.documents import Document
+from requests.adapters import HTTPAdapter
+
+from extract import MIN_ARTICLE_CHARS, extract_main_text
+
+# URL fetching settings
+URL_TIMEOUT = 15  # seconds allowed for each URL
+MAX_URL_WORKERS = 5
+
+# Query parameters that only track the visitor and never change the page content.
+# Names are compared exactly, except for the utm_ family.
+TRACKING_PARAM_PREFIXES = ("utm_",)
+TRACKING_PARAMS = {"fbclid", "gclid", "yclid", "mc_cid", "mc_eid", "ref", "ref_src"}
+
+
+# Function to build an HTTP session with a connection pool sized for the fetch workers
+def create_http_session(pool_size=MAX_URL_WORKERS):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = "Mozilla/5.0 (compatible; content-generator)"
+    return session
+
+
+# Function to normalize a URL so the same page always maps to the same cache key
+def normalize_url(url):
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or "https"
+    host = (parts.hostname or "").lower()
+    if parts.port and not (scheme == "http" and parts.port == 80) and not (scheme == "https" and parts.port == 443):
+        host = f"{host}:{parts.port}"
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = sorted(
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not (name.lower().startswith(TRACKING_PARAM_PREFIXES) or name.lower() in TRACKING_PARAMS)
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+# Function to fetch and parse a single URL, going through the content cache when given.
+# Fresh cache entries skip the network; stale ones are revalidated with ETag/Last-Modified.
+# Pages with no text fail like a network error; tiny results are returned but never cached.
+def fetch_url(url, session, cache=None, timeout=URL_TIMEOUT):
+    key = normalize_url(url)
+    entry = cache.get(key) if cache else None
+    if entry and entry["fresh"]:
+        return entry["value"]
+
+    headers = {}
+    if entry:
+        if entry["meta"].get("etag"):
+            headers["If-None-Match"] = entry["meta"]["etag"]
+        if entry["meta"].get("last_modified"):
+            headers["If-Modified-Since"] = entry["meta"]["last_modified"]
+
+    response = session.get(url, headers=headers, timeout=timeout)
+    if response.status_code == 304 and entry:
+        cache.touch(key)
+        return entry["value"]
+    response.raise_for_status()
+    # Only guess the encoding when the server doesn't declare one
+    if "charset=" not in response.headers.get("Content-Type", "").lower():
+        response.encoding = response.apparent_encoding
+    text = extract_main_text(response.text)
+    if not text.strip():
+        raise ValueError(f"No text found at {url}")
+
+    if cache and len(text) >= MIN_ARTICLE_CHARS:
+        cache.set(key, text, {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        })
+    return text
+
+
+# Function to load and parse content from URLs concurrently.
+# Returns the article texts (in the original URL order) and the list of URLs that failed.
+def load_url_texts(urls, session, cache=None, timeout=URL_TIMEOUT, max_workers=MAX_URL_WORKERS):
+    urls = [url.strip() for url in urls if url.strip()]
+    if not urls:
+        return [], []
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(urls)))
+    futures = [executor.submit(fetch_url, url, session, cache, timeout) for url in urls]
+    # Each fetch runs in parallel, so the whole batch gets one URL timeout (plus parsing slack)
+    wait(futures, timeout=timeout + 5)
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    texts = []
+    failed_urls = []
+    for url, future in zip(urls, futures):
+        if not future.done() or future.exception() is not None:
+            failed_urls.append(url)
+            continue
+        texts.append(future.result())
+    return texts, failed_urls
+
+
+# Function to build the Tavily cache key from the normalized query and the retriever settings
+def tavily_cache_key(query, k, include_raw_content):
+    normalized_query = " ".join(query.split()).casefold()
+    return json.dumps([normalized_query, k, bool(include_raw_content)], ensure_ascii=False)
+
+
+# Function to run a Tavily search through the search cache.
+# Returns the documents and whether they were served from the cache.
+def search_tavily(retriever, query, cache=None):
+    key = tavily_cache_key(query, retriever.k, retriever.include_raw_content)
+    entry = cache.get(key) if cache else None
+    if entry:
+        return [Document(page_content=doc["page_content"], metadata=doc["metadata"]) for doc in entry["value"]], True
+
+    docs = retriever.get_relevant_documents(query)
+    if cache:
+        cache.set(key, [{"page_content": doc.page_content, "metadata": doc.metadata} for doc in docs])
+    return docs, False
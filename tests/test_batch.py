@@ -0,0 +1,30 @@
+import pytest
+
+from batch import read_completed_ids, read_jobs, resolve_model
+
+
+def test_jobs_use_the_command_line_provider_and_model_by_default():
+    assert resolve_model({}, "Groq", "llama-3.1-70b-versatile") == ("Groq", "llama-3.1-70b-versatile")
+    assert resolve_model({"model": "llama3-70b-8192"}, "Groq", "llama-3.1-70b-versatile") == ("Groq", "llama3-70b-8192")
+
+
+def test_switching_provider_picks_that_providers_first_model():
+    assert resolve_model({"provider": "OpenAI"}, "Groq", "llama3-70b-8192") == ("OpenAI", "gpt-4o")
+    assert resolve_model({"provider": "OpenAI", "model": "gpt-4o-mini"}, "Groq", "llama3-70b-8192") == ("OpenAI", "gpt-4o-mini")
+
+
+def test_unknown_providers_and_mismatched_models_are_rejected():
+    with pytest.raises(ValueError, match="Unknown provider"):
+        resolve_model({"provider": "Anthropic"}, "Groq", "llama3-70b-8192")
+    with pytest.raises(ValueError, match="has no model"):
+        resolve_model({"provider": "OpenAI", "model": "llama3-70b-8192"}, "Groq", "llama3-70b-8192")
+
+
+def test_resume_skips_only_jobs_that_succeeded(tmp_path):
+    jobs = tmp_path / "jobs.jsonl"
+    jobs.write_text('{"id": 1, "mode": "SEO"}\n\n{"mode": "YENİDEN YAZMA"}\n', encoding="utf-8")
+    assert [job["id"] for job in read_jobs(jobs)] == ["1", "3"]
+
+    output = tmp_path / "results.jsonl"
+    output.write_text('{"id": "1", "status": "ok"}\n{"id": "3", "status": "error"}\n{"id": "4", "sta', encoding="utf-8")
+    assert read_completed_ids(output) == {"1"}
@@ -0,0 +1,39 @@
+from budget import CHARS_PER_TOKEN, assemble_context, context_budget, estimate_tokens, fit_text
+
+
+def test_estimate_tokens_rounds_up():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("a") == 1
+    assert estimate_tokens("a" * CHARS_PER_TOKEN * 4) == 4
+
+
+def test_context_budget_uses_model_window_and_never_goes_negative():
+    assert context_budget("gpt-4o", 1000, "") > context_budget("llama3-70b-8192", 1000, "")
+    assert context_budget("llama3-70b-8192", 10000, "") == 0
+
+
+def test_fit_text_keeps_whole_paragraphs():
+    text = "\n\n".join(["a" * 30, "b" * 30, "c" * 30])
+    fitted = fit_text(text, 25)
+    assert fitted == "\n\n".join(["a" * 30, "b" * 30])
+
+
+def test_fit_text_cuts_a_single_long_paragraph_at_a_word():
+    fitted = fit_text("kelime " * 100, 10)
+    assert len(fitted) <= 10 * CHARS_PER_TOKEN
+    assert fitted.endswith("kelime")
+
+
+def test_assemble_context_returns_everything_that_fits():
+    context, stats = assemble_context(["bir", " ", "iki"], 100)
+    assert context == "bir\n\niki"
+    assert stats["input_tokens"] == stats["output_tokens"]
+
+
+def test_assemble_context_gives_short_sources_room_and_keeps_order():
+    short = "kısa kaynak"
+    long = "\n\n".join("uzun paragraf " * 5 for _ in range(40))
+    context, stats = assemble_context([long, short], 200)
+    assert context.startswith("uzun paragraf")
+    assert context.endswith(short)
+    assert stats["output_tokens"] <= 200 < stats["input_tokens"]
@@ -0,0 +1,69 @@
+import pytest
+
+import cache as cache_module
+from cache import SQLiteCache, repair_cache_key, response_cache_key
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    return now
+
+
+def test_values_round_trip_with_meta(tmp_path):
+    store = SQLiteCache(str(tmp_path / "cache.sqlite"))
+    store.set("key", {"text": "Haber", "list": [1, 2]}, {"etag": "abc"})
+    entry = store.get("key")
+    assert entry["value"] == {"text": "Haber", "list": [1, 2]}
+    assert entry["meta"] == {"etag": "abc"}
+    assert entry["fresh"] is True
+    assert store.get("missing") is None
+
+
+def test_expired_entries_are_dropped(tmp_path, clock):
+    store = SQLiteCache(str(tmp_path / "cache.sqlite"), ttl=60)
+    store.set("key", "value")
+    clock[0] += 59
+    assert store.get("key")["fresh"] is True
+    clock[0] += 2
+    assert store.get("key") is None
+
+
+def test_stale_entries_are_kept_for_revalidation_and_touch_refreshes_them(tmp_path, clock):
+    store = SQLiteCache(str(tmp_path / "cache.sqlite"), ttl=60, keep_stale=True)
+    store.set("key", "value")
+    clock[0] += 120
+    entry = store.get("key")
+    assert entry["value"] == "value" and entry["fresh"] is False
+    store.touch("key")
+    assert store.get("key")["fresh"] is True
+
+
+def test_least_recently_used_entries_are_evicted_first(tmp_path, clock):
+    store = SQLiteCache(str(tmp_path / "cache.sqlite"), max_bytes=25)
+    store.set("a", "x" * 8)
+    clock[0] += 1
+    store.set("b", "x" * 8)
+    clock[0] += 1
+    store.get("a")
+    clock[0] += 1
+    store.set("c", "x" * 8)
+    assert store.get("b") is None
+    assert store.get("a") is not None and store.get("c") is not None
+
+
+def test_response_cache_key_depends_on_every_setting():
+    key = response_cache_key("Groq", "llama3-70b-8192", 0.0, 1000, "prompt")
+    assert key == response_cache_key("Groq", "llama3-70b-8192", 0.0, 1000, "prompt")
+    assert key != response_cache_key("Groq", "llama3-70b-8192", 0.5, 1000, "prompt")
+    assert key != response_cache_key("OpenAI", "llama3-70b-8192", 0.0, 1000, "prompt")
+    assert key != response_cache_key("Groq", "llama3-70b-8192", 0.0, 1000, "prompt 2")
+
+
+def test_repair_cache_key_depends_on_the_response_and_the_text():
+    key = repair_cache_key("response", "metin")
+    assert key == repair_cache_key("response", "metin")
+    assert key != repair_cache_key("response", "başka metin")
+    assert key != repair_cache_key("other", "metin")
+    assert key != "response"
@@ -0,0 +1,42 @@
+from cache import SQLiteCache
+from condense import condense_sources, fact_sheet_key, fit_source, merge_fact_sheets
+
+
+def recording_condenser(calls):
+    def condense(text):
+        calls.append(text)
+        return f"  Özet: {text}\n"
+    return condense
+
+
+def test_sheets_keep_the_source_order():
+    calls = []
+    sheets, hits = condense_sources(["bir", " ", "iki", "üç"], recording_condenser(calls), "Groq / model")
+    assert sheets == ["Özet: bir", "Özet: iki", "Özet: üç"]
+    assert hits == 0
+    assert sorted(calls) == ["bir", "iki", "üç"]
+
+
+def test_swapping_one_source_only_condenses_that_source(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "sheets.sqlite"))
+    condense_sources(["bir", "iki", "üç"], recording_condenser([]), "Groq / model", cache)
+    calls = []
+    sheets, hits = condense_sources(["bir", "dört", "üç"], recording_condenser(calls), "Groq / model", cache)
+    assert calls == ["dört"]
+    assert hits == 2
+    assert sheets == ["Özet: bir", "Özet: dört", "Özet: üç"]
+
+
+def test_sheets_are_cached_per_model():
+    assert fact_sheet_key("Groq / a", "metin") != fact_sheet_key("OpenAI / b", "metin")
+    assert fact_sheet_key("Groq / a", "metin") == fact_sheet_key("Groq / a", "metin")
+
+
+def test_long_sources_are_cut_to_the_models_window():
+    text = "\n\n".join("Uzun paragraf " * 20 for _ in range(500))
+    assert len(fit_source(text, "llama3-70b-8192")) < len(text)
+    assert fit_source("kısa", "llama3-70b-8192") == "kısa"
+
+
+def test_merge_labels_each_sheet_with_its_source():
+    assert merge_fact_sheets(["A", "B"]) == "Kaynak 1:\nA\n\nKaynak 2:\nB"
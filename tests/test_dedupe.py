@@ -0,0 +1,43 @@
+from benchmarks.corpus import make_article_text
+from dedupe import dedupe_sources, similarity, sketch
+
+
+def words(text):
+    return text.lower().split()
+
+
+def test_sketch_skips_short_texts():
+    assert sketch(words("çok kısa bir metin")) is None
+
+
+def test_similarity_of_identical_and_unrelated_texts():
+    text = words(make_article_text(1, 6))
+    other = words(make_article_text(2, 6))
+    assert similarity(sketch(text), sketch(text)) == 1.0
+    assert similarity(sketch(text), sketch(other)) < 0.7
+
+
+def test_syndicated_copy_keeps_the_longest_version_in_place_of_the_first():
+    article = make_article_text(3, 6)
+    longer = article + "\nAçıklamada, çalışmaların titizlikle sürdürüldüğü ve sonuçların yakında paylaşılacağı vurgulandı."
+    other = make_article_text(4, 6)
+    texts, stats = dedupe_sources([article, other, longer])
+    assert texts[0].endswith("paylaşılacağı vurgulandı.")
+    assert stats["duplicate_documents"] == 1
+    assert len(texts) == 2
+
+
+def test_repeated_paragraphs_are_kept_once():
+    shared = "Merkez Bankası faiz kararını perşembe günü açıklayacağını ve piyasaların kararı beklediğini duyurdu."
+    first = "Birinci kaynağın kendine özgü ve oldukça uzun bir giriş paragrafı burada yer alıyor.\n\n" + shared
+    second = "İkinci kaynak konuya tamamen farklı bir açıdan yaklaşarak başka ayrıntılar veriyor.\n\n" + shared
+    texts, stats = dedupe_sources([first, second])
+    assert stats["duplicate_paragraphs"] == 1
+    assert shared in texts[0] and shared not in texts[1]
+    assert stats["tokens_saved"] > 0
+
+
+def test_short_paragraphs_are_only_collapsed_when_equal():
+    texts, stats = dedupe_sources(["Kısa başlık\n\nBaşka satır", "Kısa başlık\n\nFarklı satır"])
+    assert stats["duplicate_paragraphs"] == 1
+    assert texts == ["Kısa başlık\n\nBaşka satır", "Farklı satır"]
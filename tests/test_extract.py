@@ -0,0 +1,56 @@
+from benchmarks.corpus import make_article, make_article_html, make_article_text
+from extract import extract_main_text, strip_boilerplate_lines
+
+PARAGRAPH = "Bakan, yeni düzenlemenin önümüzdeki ay yürürlüğe gireceğini ve başvuruların internetten alınacağını açıkladı."
+
+
+def test_news_page_keeps_headline_and_body_without_boilerplate():
+    headline, body = make_article(1, 4)
+    text = extract_main_text(make_article_html(1, 4))
+    assert text.split("\n\n") == [headline] + body
+    for leftover in ("Ana Sayfa", "çerez", "Facebook", "İlgili Haberler", "Yorumlar", "Tüm hakları"):
+        assert leftover not in text
+
+
+def test_class_names_are_matched_by_whole_word():
+    html = (
+        '<html><body><div class="container has-sidebar"><div class="news-detail">'
+        f"<h1>Yeni düzenleme açıklandı</h1><p>{PARAGRAPH}</p></div></div>"
+        '<div class="sidebar"><p>Çok okunanlar</p></div></body></html>'
+    )
+    assert extract_main_text(html) == f"Yeni düzenleme açıklandı\n\n{PARAGRAPH}"
+
+
+def test_text_heavy_elements_are_kept_whatever_their_name():
+    html = f'<html><body><div class="comments-wrapper"><p>{PARAGRAPH}</p><p>{PARAGRAPH} Ek</p></div></body></html>'
+    assert PARAGRAPH in extract_main_text(html)
+
+
+def test_headline_outside_the_article_body_is_added_back():
+    html = f'<html><body><h1>Yeni düzenleme açıklandı</h1><div itemprop="articleBody"><p>{PARAGRAPH}</p></div></body></html>'
+    assert extract_main_text(html).startswith("Yeni düzenleme açıklandı\n\n")
+
+
+def test_pages_without_article_markup_fall_back_to_their_text():
+    html = "<html><body><div class='menu'><span>Toplantı yarın saat onda belediye binasında yapılacak</span></div></body></html>"
+    assert extract_main_text(html) == "Toplantı yarın saat onda belediye binasında yapılacak"
+    assert extract_main_text("<html><body><script>var a = 1;</script></body></html>") == ""
+
+
+def test_plain_text_drops_menus_and_footer_lines():
+    headline, body = make_article(2, 3)
+    assert strip_boilerplate_lines(make_article_text(2, 3)) == "\n".join([headline] + body)
+
+
+def test_platform_names_inside_sentences_are_kept():
+    text = "Bakan açıklamayı Twitter hesabından yaptı.\nReklam gelirleri arttı.\nFacebook Twitter WhatsApp"
+    assert strip_boilerplate_lines(text) == "Bakan açıklamayı Twitter hesabından yaptı.\nReklam gelirleri arttı."
+
+
+def test_short_lines_in_the_middle_and_paragraph_breaks_are_kept():
+    text = f"{PARAGRAPH}\n\nKim: Bakan\nNe: Toplantı\nNerede: Ankara\n\n{PARAGRAPH} Sonra"
+    assert strip_boilerplate_lines(text) == text
+
+
+def test_text_made_only_of_short_lines_is_kept():
+    assert strip_boilerplate_lines("Kim: Bakan\nNe: Toplantı\nNerede: Ankara") == "Kim: Bakan\nNe: Toplantı\nNerede: Ankara"
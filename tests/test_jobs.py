@@ -0,0 +1,68 @@
+import threading
+
+from jobs import DONE, FAILED, QUEUED, RUNNING, JobQueue
+
+
+def wait_for(queue, job_id, status):
+    for _ in range(200):
+        job = queue.get(job_id)
+        if job["status"] == status:
+            return job
+        threading.Event().wait(0.01)
+    raise AssertionError(f"job {job_id} is {queue.get(job_id)['status']}, expected {status}")
+
+
+def test_job_moves_from_queued_to_running_to_done(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite"), workers=1)
+    started, release = threading.Event(), threading.Event()
+
+    def work(handle):
+        started.set()
+        release.wait(5)
+        handle.append("Haber ")
+        handle.set_meta(violations=[])
+        return handle.text() + "metni"
+
+    first = queue.submit({"mode": "SEO"}, work)
+    second = queue.submit({"mode": "SEO"}, lambda handle: "ikinci")
+    assert started.wait(5)
+    assert queue.get(first)["status"] == RUNNING
+    assert queue.get(second)["status"] == QUEUED
+    assert queue.position(second) == 0
+    release.set()
+
+    job = wait_for(queue, first, DONE)
+    assert job["result"] == "Haber metni"
+    assert job["partial"] is None
+    assert job["meta"] == {"violations": []}
+    assert job["params"] == {"mode": "SEO"}
+    wait_for(queue, second, DONE)
+    assert [job["id"] for job in queue.list([first, second])] == [second, first]
+
+
+def test_failed_job_keeps_its_error_and_partial_output(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite"), workers=1)
+
+    def work(handle):
+        handle.append("Yarım metin")
+        raise RuntimeError("model unavailable")
+
+    job = wait_for(queue, queue.submit({}, work), FAILED)
+    assert job["error"] == "RuntimeError: model unavailable"
+    assert job["partial"] == "Yarım metin"
+
+
+def test_unfinished_jobs_fail_after_a_restart(tmp_path):
+    path = str(tmp_path / "jobs.sqlite")
+    queue = JobQueue(path, workers=1)
+    release = threading.Event()
+    running = queue.submit({}, lambda handle: release.wait(5) and "bitti")
+    queued = queue.submit({}, lambda handle: "sonra")
+    wait_for(queue, running, RUNNING)
+
+    restarted = JobQueue(path, workers=1)
+    for job_id in (running, queued):
+        job = restarted.get(job_id)
+        assert job["status"] == FAILED
+        assert job["error"] == "Interrupted by a server restart."
+    release.set()
@@ -0,0 +1,51 @@
+import threading
+import time
+
+from batch import RateLimiter
+from benchmarks.fakes import FakeChatModel
+from prompts import SEO_MODE
+from validate import repair_output, validate_output
+
+
+def test_acquire_returns_at_once_while_the_window_has_room():
+    limiter = RateLimiter(rpm=3, tpm=100)
+    start = time.monotonic()
+    entries = [limiter.acquire(30) for _ in range(3)]
+    assert time.monotonic() - start < 0.1
+    assert [entry[1] for entry in entries] == [30, 30, 30]
+
+
+def test_reservations_are_capped_at_the_token_limit():
+    limiter = RateLimiter(rpm=3, tpm=100)
+    assert limiter.acquire(500)[1] == 100
+
+
+def test_record_wakes_a_waiter_when_it_frees_tokens():
+    limiter = RateLimiter(rpm=10, tpm=100)
+    entry = limiter.acquire(100)
+    threading.Timer(0.2, limiter.record, args=(entry, 10)).start()
+    start = time.monotonic()
+    limiter.acquire(50)
+    assert 0.15 < time.monotonic() - start < 1.0
+
+
+def test_requests_per_minute_are_limited():
+    limiter = RateLimiter(rpm=1, tpm=100)
+    limiter.acquire(1)
+    acquired = threading.Event()
+    threading.Thread(target=lambda: (limiter.acquire(1), acquired.set()), daemon=True).start()
+    assert not acquired.wait(0.3)
+    # Age the first request out of the window; the waiter picks it up on its next check
+    limiter.window[0][0] -= 60
+    assert acquired.wait(2)
+
+
+def test_each_repair_call_takes_its_own_rate_limit_reservation():
+    text = "**Başlık:** Kısa başlık\n**Spot:** Kısa spot.\n\n## Giriş\n\nAltın yükseldi."
+    violations = [violation for violation in validate_output(text, SEO_MODE) if violation["rule"] != "min_words"]
+    limiter = RateLimiter(rpm=10, tpm=100000)
+    llm = FakeChatModel(ttft=0, tokens_per_second=1e6, output_tokens=3)
+    _, stats = repair_output(text, SEO_MODE, llm, violations, "altın", limiter=limiter)
+    assert stats["repair_calls"] == 2
+    assert len(limiter.window) == 2
+    assert sum(entry[1] for entry in limiter.window) == stats["repair_tokens"]
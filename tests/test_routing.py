@@ -0,0 +1,67 @@
+import pytest
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+
+import routing
+from benchmarks.fakes import FakeChatModel
+from routing import HedgedChain, is_rate_limited
+
+PROMPT = ChatPromptTemplate.from_template("{context}")
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+class FailingChain:
+    def stream(self, inputs, config=None):
+        raise RateLimitError("rate limit reached")
+        yield
+
+
+def fake_chain(ttft, output_tokens=5):
+    return PROMPT | FakeChatModel(ttft=ttft, tokens_per_second=1e6, output_tokens=output_tokens) | StrOutputParser()
+
+
+@pytest.fixture
+def decisions(monkeypatch):
+    events = []
+    monkeypatch.setattr(routing, "log_decision", events.append)
+    return events
+
+
+def test_fast_primary_wins_without_a_hedge(decisions):
+    chain = HedgedChain([("primary", fake_chain(0)), ("fallback", fake_chain(0))], hedge_after=1.0)
+    assert chain.invoke({"context": "x"}) == "kelime " * 5
+    assert chain.route["winner"] == "primary"
+    assert [event["event"] for event in decisions] == ["primary", "first_token", "complete"]
+
+
+def test_slow_primary_is_hedged_and_cancelled(decisions):
+    chain = HedgedChain([("primary", fake_chain(1.0)), ("fallback", fake_chain(0))], hedge_after=0.05)
+    assert chain.invoke({"context": "x"}) == "kelime " * 5
+    assert chain.route["winner"] == "fallback"
+    events = [(event["event"], event["model"]) for event in decisions]
+    assert ("hedge", "fallback") in events
+    assert ("cancel", "primary") in events
+
+
+def test_rate_limited_primary_fails_over_at_once(decisions):
+    chain = HedgedChain([("primary", FailingChain()), ("fallback", fake_chain(0))], hedge_after=10.0)
+    assert chain.invoke({"context": "x"}) == "kelime " * 5
+    assert chain.route["winner"] == "fallback"
+    error = next(event for event in decisions if event["event"] == "error")
+    assert error["rate_limited"] is True
+    assert decisions[-1]["elapsed_s"] < 1.0
+
+
+def test_error_is_raised_when_every_candidate_fails(decisions):
+    chain = HedgedChain([("primary", FailingChain())], hedge_after=0.1)
+    with pytest.raises(RateLimitError):
+        chain.invoke({"context": "x"})
+
+
+def test_is_rate_limited():
+    assert is_rate_limited(RateLimitError())
+    assert is_rate_limited(Exception("Rate limit exceeded"))
+    assert not is_rate_limited(ValueError("bad request"))
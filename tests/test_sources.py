@@ -0,0 +1,78 @@
+from benchmarks.fakes import StubTavilyRetriever
+from cache import SQLiteCache
+from sources import fetch_url, normalize_url, search_tavily, tavily_cache_key
+
+ARTICLE = "<html><body><article><h1>Altın rekor kırdı</h1><p>" + "Gram altın güne yükselişle başladı. " * 10 + "</p></article></body></html>"
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+        self.encoding = None
+        self.apparent_encoding = "utf-8"
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class FakeSession:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(headers or {})
+        return self.responses.pop(0)
+
+
+def test_tracking_params_are_matched_by_exact_name():
+    assert normalize_url("https://site.com/haber.php?refid=123") != normalize_url("https://site.com/haber.php?refid=456")
+    assert normalize_url("https://site.com/haber.php?refid=123&ref=tw") == "https://site.com/haber.php?refid=123"
+    assert normalize_url("https://site.com/haber?id=5&utm_source=x&utm_medium=y") == "https://site.com/haber?id=5"
+
+
+def test_stale_pages_are_revalidated_and_a_304_keeps_the_cached_text(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "urls.sqlite"), ttl=0, keep_stale=True)
+    session = FakeSession(
+        FakeResponse(text=ARTICLE, headers={"ETag": '"v1"', "Content-Type": "text/html; charset=utf-8"}),
+        FakeResponse(status_code=304),
+    )
+    first = fetch_url("https://site.com/haber/1", session, cache)
+    assert first.startswith("Altın rekor kırdı")
+    assert fetch_url("https://site.com/haber/1", session, cache) == first
+    assert session.requests[1] == {"If-None-Match": '"v1"'}
+
+
+def test_declared_charset_is_kept():
+    response = FakeResponse(text=ARTICLE, headers={"Content-Type": "text/html; charset=iso-8859-9"})
+    fetch_url("https://site.com/haber/1", FakeSession(response))
+    assert response.encoding is None
+    response = FakeResponse(text=ARTICLE, headers={"Content-Type": "text/html"})
+    fetch_url("https://site.com/haber/1", FakeSession(response))
+    assert response.encoding == "utf-8"
+
+
+def test_normalize_url_maps_the_same_page_to_one_key():
+    expected = "https://site.com/haber?a=1&b=2"
+    assert normalize_url("HTTPS://Site.com:443/haber/?b=2&a=1#yorumlar") == expected
+    assert normalize_url("  https://site.com/haber?a=1&b=2&fbclid=xyz ") == expected
+    assert normalize_url("http://site.com:8080/") == "http://site.com:8080/"
+
+
+def test_tavily_cache_key_normalizes_the_query_and_keeps_the_settings():
+    assert tavily_cache_key("  Altın   Fiyatları ", 2, True) == tavily_cache_key("altın fiyatları", 2, True)
+    assert tavily_cache_key("altın fiyatları", 2, True) != tavily_cache_key("altın fiyatları", 3, True)
+    assert tavily_cache_key("altın fiyatları", 2, True) != tavily_cache_key("altın fiyatları", 2, False)
+
+
+def test_search_tavily_serves_repeated_queries_from_the_cache(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "tavily.sqlite"))
+    retriever = StubTavilyRetriever(k=2, latency=0)
+    docs, hit = search_tavily(retriever, "altın fiyatları", cache)
+    assert not hit and len(docs) == 2
+    cached, hit = search_tavily(retriever, "Altın  fiyatları", cache)
+    assert hit
+    assert [(doc.page_content, doc.metadata) for doc in cached] == [(doc.page_content, doc.metadata) for doc in docs]
@@ -0,0 +1,88 @@
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.prompts import ChatPromptTemplate
+
+from benchmarks.fakes import FakeChatModel
+from prompts import SEO_MODE, expand_prompt, length_repair_prompt, sentence_repair_prompt
+from validate import (
+    count_words,
+    find_title_and_spot,
+    replace_section_value,
+    repair_output,
+    split_sentences,
+    validate_output,
+)
+
+NEWS_MODE = "BİR METİNDEN HABER YAZMA"
+
+
+def test_split_sentences_keeps_abbreviations_and_ordinals_together():
+    line = "Prof. Dr. Ayşe Yılmaz açıklama yaptı. Takım 3. Lig'e düştü! Maç yarın mı?"
+    assert split_sentences(line) == ["Prof. Dr. Ayşe Yılmaz açıklama yaptı.", "Takım 3. Lig'e düştü!", "Maç yarın mı?"]
+
+
+def test_long_sentences_and_banned_forms_are_reported():
+    text = "# Başlık\n\nBakan bugün Ankara'da düzenlenen toplantıda yeni ekonomi paketinin bütün ayrıntılarını tek tek açıkladı. Karar açıklanabilir."
+    violations = validate_output(text, NEWS_MODE)
+    assert [violation["rule"] for violation in violations] == ["sentence", "sentence"]
+    assert "words" in violations[0]["detail"]
+    assert "açıklanabilir" in violations[1]["detail"]
+    assert all(violation["line"] == 2 for violation in violations)
+
+
+def test_headings_are_not_checked_as_sentences():
+    assert validate_output("## Bakanlık bugün yaptığı yazılı açıklamada yeni düzenlemenin ayrıntılarını duyurmaktadır", NEWS_MODE) == []
+
+
+def test_seo_title_spot_and_length():
+    text = "**Başlık:** Altın **fiyatları** kısa\n**Spot:** Kısa spot.\n\n## Giriş\n\nAltın yükseldi."
+    title, spot = find_title_and_spot(text.splitlines())
+    assert title == (0, "Altın fiyatları kısa")
+    assert spot == (1, "Kısa spot.")
+    rules = {violation["rule"] for violation in validate_output(text, SEO_MODE)}
+    assert rules == {"title_chars", "spot_chars", "min_words"}
+
+
+def test_replace_section_value_keeps_label_and_markup():
+    assert replace_section_value("**Başlık:** Altın **fiyatları** kısa", "Yeni") == "**Başlık:** Yeni"
+    assert replace_section_value("**Spot: eski spot**", "Yeni") == "**Spot: Yeni**"
+    assert replace_section_value("# Altın **rekor**", "Yeni") == "# Yeni"
+
+
+def test_repair_templates_take_exactly_the_inputs_repair_output_passes():
+    expected = {
+        sentence_repair_prompt: {"rules", "sentences"},
+        length_repair_prompt: {"field", "min_chars", "max_chars", "length", "konu", "text"},
+        expand_prompt: {"konu", "words", "min_words", "missing", "outline", "context"},
+    }
+    for template, inputs in expected.items():
+        assert set(ChatPromptTemplate.from_template(template).input_variables) == inputs
+
+
+def test_repair_splices_only_the_broken_sentence():
+    text = "Kısa bir giriş.\nBakan bugün Ankara'da düzenlenen uzun toplantıda yeni ekonomi paketinin bütün ayrıntılarını tek tek açıkladı."
+    llm = FakeListChatModel(responses=["1. Bakan yeni paketi açıkladı. Toplantı Ankara'da yapıldı."])
+    repaired, stats = repair_output(text, NEWS_MODE, llm)
+    assert repaired == "Kısa bir giriş.\nBakan yeni paketi açıkladı. Toplantı Ankara'da yapıldı."
+    assert stats["violations"] == 1
+    assert stats["remaining"] == 0
+    assert stats["repair_calls"] == 1
+
+
+def test_repair_rewrites_a_bold_title_in_place():
+    text = "**Başlık:** Altın **fiyatları** kısa\n\n## Giriş\n\nAltın yükseldi."
+    violations = [violation for violation in validate_output(text, SEO_MODE) if violation["rule"] == "title_chars"]
+    llm = FakeListChatModel(responses=["Altın Fiyatları Bugün Rekor Kırdı: Gram Altın Ne Kadar Oldu?"])
+    repaired, _ = repair_output(text, SEO_MODE, llm, violations, "altın")
+    assert repaired.splitlines()[0] == "**Başlık:** Altın Fiyatları Bugün Rekor Kırdı: Gram Altın Ne Kadar Oldu?"
+
+
+def test_repair_expands_short_seo_articles_before_the_last_heading():
+    text = "## Giriş\n\nAltın yükseldi.\n\n## Sonuç\n\nPiyasa sakin."
+    violations = [violation for violation in validate_output(text, SEO_MODE) if violation["rule"] == "min_words"]
+    llm = FakeChatModel(ttft=0, tokens_per_second=1e6, output_tokens=1000)
+    repaired, stats = repair_output(text, SEO_MODE, llm, violations, "altın", "context")
+    lines = repaired.splitlines()
+    assert lines.index("## Sonuç") > lines.index("## Giriş") + 2
+    assert count_words(repaired) >= 1000
+    assert stats["repair_tokens"] > 0
+
@@ -0,0 +1,272 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.prompts import ChatPromptTemplate
+
+from budget import estimate_tokens
+from pipeline import create_repair_chain
+from prompts import MULTI_SOURCE_MODE, SEO_MODE, expand_prompt, length_repair_prompt, sentence_repair_prompt
+
+# Hard rules each prompt mode sets for its output
+MODE_RULES = {
+    SEO_MODE: {"banned_forms": True, "title_chars": (50, 60), "spot_chars": (150, 160), "min_words": 1000},
+    "BİR METİNDEN HABER YAZMA": {"max_sentence_words": 12, "banned_forms": True},
+    MULTI_SOURCE_MODE: {"max_sentence_words": 12, "banned_forms": True},
+    "KÖŞE YAZISINDAN HABER YAZMA": {},
+    "HABERİ YENİDEN YAZMA": {"max_sentence_words": 12},
+}
+
+# Verb forms the prompts forbid: -ebilir/-abilir, -ebilecek/-abilecek, -mektedir/-maktadır (with any suffixes)
+BANNED_FORM_PATTERN = re.compile(r"\b\w*?(?:[ae]bil(?:ir|ecek)|mekted[iı]r|maktad[ıi]r)\w*", re.IGNORECASE)
+
+# Abbreviations whose period doesn't end a sentence (compared in Turkish lower case)
+ABBREVIATIONS = {
+    "dr", "prof", "doç", "yrd", "öğr", "gör", "op", "uzm", "av", "müh", "sn", "st", "no", "nr",
+    "vb", "vs", "bkz", "örn", "cad", "sok", "mah", "apt", "blv", "tel", "gen", "org", "korg",
+    "tümg", "tuğg", "alb", "yzb", "bşk", "başk", "ltd", "şti", "a.ş", "t.c", "m.ö", "m.s", "s", "sf",
+}
+
+# A sentence ends at . ! ? or … (plus closing quotes/brackets/bold) before a capital letter, digit or opening quote
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?…])[\"”’')\]*]*\s+(?=[\"“‘(*]*[A-ZÇĞİÖŞÜ0-9])")
+LIST_MARKER = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+")
+SECTION_LABEL = re.compile(r"^(başlık|seo başlığı|spot(?: cümle(?:si)?)?|meta açıklama(?:sı)?)\s*(?:\([^)]*\))?\s*(?::\s*(.*))?$")
+WORD_PATTERN = re.compile(r"\w+(?:['’]\w+)*")
+NUMBERED_LINE = re.compile(r"^\s*(\d+)[.)]\s*(.+?)\s*$")
+LINE_MARKUP = re.compile(r"^\s*(?:#+\s*)?(?:\*\*|__)?")
+
+
+# Function to lower-case Turkish text (I → ı, İ → i)
+def turkish_lower(text):
+    return text.replace("I", "ı").replace("İ", "i").lower()
+
+
+# Function to drop markdown emphasis and heading marks from a line
+def plain(text):
+    return text.replace("**", "").replace("__", "").strip().lstrip("#").strip()
+
+
+# Function to count the words of a text
+def count_words(text):
+    return len(WORD_PATTERN.findall(text))
+
+
+# Function to tell headings (markdown, bold-only or upper-case lines) apart from running text
+def is_heading(line):
+    stripped = line.strip()
+    if stripped.startswith("#"):
+        return True
+    if stripped.startswith("**") and stripped.endswith("**") and stripped.count("**") == 2:
+        return True
+    letters = [char for char in plain(stripped) if char.isalpha()]
+    return bool(letters) and all(char.isupper() for char in letters) and count_words(stripped) <= 10
+
+
+# Function to split one line of text into sentences. Periods after abbreviations, initials and
+# ordinal numbers ("3. Lig", "Prof. Dr.") don't end a sentence.
+def split_sentences(line):
+    pieces = SENTENCE_BOUNDARY.split(line.strip())
+    sentences = []
+    for piece in pieces:
+        if sentences:
+            last_word = turkish_lower(plain(sentences[-1]).rstrip(".").rsplit(" ", 1)[-1])
+            if sentences[-1].endswith(".") and (
+                last_word in ABBREVIATIONS or last_word.isdigit() or (len(last_word) == 1 and last_word.isalpha())
+            ):
+                sentences[-1] = f"{sentences[-1]} {piece}"
+                continue
+        sentences.append(piece)
+    return [sentence for sentence in sentences if sentence]
+
+
+# Function to find the labelled value of a section (e.g. "**Başlık:** ...") and its line number.
+# A label alone on its line takes its value from the next non-empty line.
+def find_section(lines, labels):
+    for index, line in enumerate(lines):
+        match = SECTION_LABEL.match(turkish_lower(plain(line)).rstrip("*").strip())
+        if not match or not match.group(1).startswith(labels):
+            continue
+        if match.group(2):
+            value = plain(line).split(":", 1)[1].strip().strip("*").strip()
+            return index, value
+        for next_index in range(index + 1, len(lines)):
+            if lines[next_index].strip():
+                return next_index, plain(lines[next_index]).strip("*").strip()
+    return None
+
+
+# Function to locate the SEO title and spot by their labels; an unlabelled title is the opening heading
+def find_title_and_spot(lines):
+    title = find_section(lines, ("başlık", "seo başlığı"))
+    spot = find_section(lines, ("spot", "meta açıklama"))
+    filled = [index for index, line in enumerate(lines) if line.strip()]
+    if title is None and filled and is_heading(lines[filled[0]]):
+        title = (filled[0], plain(lines[filled[0]]).strip("*").strip())
+    return title, spot
+
+
+# Function to put a new title or spot into its line, keeping the line's label and markdown
+def replace_section_value(line, value):
+    label = SECTION_LABEL.match(turkish_lower(plain(line)).rstrip("*").strip())
+    if label and label.group(2):
+        head, _, rest = line.partition(":")
+        closing = rest.lstrip()[:2] if rest.lstrip().startswith(("**", "__")) else ""
+        replaced = f"{head}:{closing} {value}"
+    else:
+        replaced = LINE_MARKUP.match(line).group(0) + value
+    # Close emphasis the value was wrapped in
+    for mark in ("**", "__"):
+        if replaced.count(mark) % 2:
+            replaced += mark
+    return replaced
+
+
+# Function to check generated text against the rules of its prompt mode.
+# Returns a list of violations: dicts with the rule, the offending text, its line and a detail.
+def validate_output(text, mode):
+    rules = MODE_RULES.get(mode, {})
+    lines = text.splitlines()
+    violations = []
+    skipped = set()
+
+    if "title_chars" in rules:
+        title, spot = find_title_and_spot(lines)
+        for rule, found in (("title_chars", title), ("spot_chars", spot)):
+            if found is None:
+                continue
+            index, value = found
+            skipped.add(index)
+            low, high = rules[rule]
+            if not low <= len(value) <= high:
+                violations.append({"rule": rule, "line": index, "text": value, "detail": f"{len(value)} characters, expected {low}-{high}"})
+
+    for index, line in enumerate(lines):
+        if index in skipped or not line.strip() or is_heading(line) or SECTION_LABEL.match(turkish_lower(plain(line)).rstrip("*").strip()):
+            continue
+        for sentence in split_sentences(LIST_MARKER.sub("", line)):
+            problems = []
+            words = count_words(plain(sentence))
+            if "max_sentence_words" in rules and words > rules["max_sentence_words"]:
+                problems.append(f"{words} words")
+            if rules.get("banned_forms"):
+                forms = BANNED_FORM_PATTERN.findall(plain(sentence))
+                if forms:
+                    problems.append("uses " + ", ".join(forms))
+            if problems:
+                violations.append({"rule": "sentence", "line": index, "text": sentence, "detail": "; ".join(problems)})
+
+    if "min_words" in rules:
+        words = count_words(plain(text))
+        if words < rules["min_words"]:
+            violations.append({"rule": "min_words", "line": None, "text": "", "detail": f"{words} words, expected at least {rules['min_words']}"})
+    return violations
+
+
+# Function to describe a mode's sentence rules for the sentence repair prompt
+def sentence_rules(mode):
+    rules = MODE_RULES.get(mode, {})
+    lines = []
+    if "max_sentence_words" in rules:
+        lines.append(f"* Her cümle en fazla {rules['max_sentence_words']} kelime olsun. Gerekirse cümleyi iki kısa cümleye böl.")
+    if rules.get("banned_forms"):
+        lines.append('* "ebilecek", "abilecek", "ebilir", "abilir", "mektedir", "maktadır" biçimlerini kullanma.')
+    lines.append("* Aktif cümle yapısı kullan.")
+    return "\n".join(lines)
+
+
+# Function to read "1. ..." lines of a repair answer into {number: text}
+def parse_numbered(answer):
+    fixes = {}
+    for line in answer.splitlines():
+        match = NUMBERED_LINE.match(line)
+        if match:
+            fixes[int(match.group(1))] = match.group(2)
+    return fixes
+
+
+# Function to fix rule violations by re-prompting only for the offending sentences and sections,
+# then splicing the fixes back into the text. All repair prompts run concurrently.
+# Returns the repaired text and stats (violations before/after, repair calls, tokens used).
+# With a rate limiter (see batch.RateLimiter) every repair call takes its own reservation.
+def repair_output(text, mode, llm, violations=None, topic="", context="", config=None, limiter=None):
+    violations = validate_output(text, mode) if violations is None else violations
+    rules = MODE_RULES.get(mode, {})
+    lines = text.splitlines()
+    tasks = []
+
+    sentences = [violation for violation in violations if violation["rule"] == "sentence"]
+    if sentences:
+        numbered = "\n".join(f"{number}. {violation['text']}" for number, violation in enumerate(sentences, start=1))
+        inputs = {"rules": sentence_rules(mode), "sentences": numbered}
+        tasks.append(("sentence", sentence_repair_prompt, inputs, sentences))
+
+    fields = {"title_chars": "SEO başlığını", "spot_chars": "spot cümlesini (meta açıklama)"}
+    for violation in violations:
+        if violation["rule"] in fields:
+            low, high = rules[violation["rule"]]
+            inputs = {
+                "field": fields[violation["rule"]],
+                "min_chars": low,
+                "max_chars": high,
+                "length": len(violation["text"]),
+                "konu": topic or "",
+                "text": violation["text"],
+            }
+            tasks.append((violation["rule"], length_repair_prompt, inputs, [violation]))
+
+    if any(violation["rule"] == "min_words" for violation in violations):
+        words = count_words(plain(text))
+        outline = "\n".join(plain(line) for line in lines if line.strip() and is_heading(line)) or "-"
+        inputs = {
+            "konu": topic or "",
+            "words": words,
+            "min_words": rules["min_words"],
+            "missing": rules["min_words"] - words + 50,
+            "outline": outline,
+            "context": context,
+        }
+        tasks.append(("min_words", expand_prompt, inputs, []))
+
+    if not tasks:
+        return text, {"violations": len(violations), "remaining": len(violations), "repair_calls": 0, "repair_tokens": 0}
+
+    def run(task):
+        _, template, inputs, _ = task
+        prompt = ChatPromptTemplate.from_template(template)
+        input_tokens = estimate_tokens(prompt.format(**inputs))
+        reservation = limiter.acquire(input_tokens + (getattr(llm, "max_tokens", None) or 0)) if limiter else None
+        answer = create_repair_chain(prompt, llm).invoke(inputs, config=config)
+        if reservation:
+            limiter.record(reservation, input_tokens + estimate_tokens(answer))
+        return answer, input_tokens + estimate_tokens(answer)
+
+    with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+        answers = list(executor.map(run, tasks))
+
+    insertion = None
+    for (kind, _, _, targets), (answer, _) in zip(tasks, answers):
+        if kind == "sentence":
+            fixes = parse_numbered(answer)
+            for number, violation in enumerate(targets, start=1):
+                if number in fixes:
+                    lines[violation["line"]] = lines[violation["line"]].replace(violation["text"], fixes[number], 1)
+        elif kind == "min_words":
+            insertion = answer.strip()
+        else:
+            fixed = plain(answer.strip().splitlines()[0]).strip("\"“”'") if answer.strip() else ""
+            if fixed:
+                violation = targets[0]
+                lines[violation["line"]] = replace_section_value(lines[violation["line"]], fixed)
+
+    if insertion:
+        # The new section goes before the last sub-heading (usually the conclusion), else at the end
+        headings = [index for index, line in enumerate(lines) if line.strip().startswith("## ")]
+        position = headings[-1] if len(headings) > 1 else len(lines)
+        lines[position:position] = [insertion, ""]
+
+    repaired = "\n".join(lines)
+    return repaired, {
+        "violations": len(violations),
+        "remaining": len(validate_output(repaired, mode)),
+        "repair_calls": len(tasks),
+        "repair_tokens": sum(tokens for _, tokens in answers),
+    }